@@ -27,6 +27,7 @@ The :mod:`erika.config` module defines constants used for the configuration or
 erika.
 """
 
+from functools import lru_cache
 from os.path import expanduser, join
 import platform
 from gi.repository import GLib
@@ -35,31 +36,47 @@ from .__version__ import __appname__
 
 
 # Directories
-HOME = expanduser("~")
 DEFAULT_CONFIG_DIRECTORY = join(GLib.get_user_config_dir(), __appname__.lower())
 
-CONFIG_DEFAULTS = {
-    "application.version": (0,),
 
-    "library.root": join(HOME, "Podcasts"),
-    "library.podcast_directory_template": "{podcast.title}",
-    "library.episode_file_template":
-        "{episode.pubdate:%Y.%m.%d} - {episode.title}",
-    "library.synchronize_interval": 60,
+@lru_cache(maxsize=None)
+def get_defaults():
+    """Return the default configuration values.
 
-    "player.smart_mark_seconds": 30,
+    The values are only computed the first time this function is called, as
+    some of them require system calls.
 
-    "downloads.workers": 2,
+    Returns
+    -------
+    dict
+        A dictionnary mapping the configuration keys to their default values.
+    """
+    home = expanduser("~")
+    node = platform.node()
 
-    "gpodder.synchronize": False,
-    "gpodder.hostname": "gpodder.net",
-    "gpodder.username": "",
-    "gpodder.password": "",
-    "gpodder.deviceid": "{}-{}".format(__appname__.lower(), platform.node()),
-    "gpodder.devicename": "{} on {}".format(__appname__, platform.node()),
-    "gpodder.devicename_changed": False,
-    "gpodder.last_subscription_sync": 0,
-    "gpodder.last_episodes_sync": 0,
+    return {
+        "application.version": (0,),
 
-    "network.connection_check_hostname": "github.com",
-}
+        "library.root": join(home, "Podcasts"),
+        "library.podcast_directory_template": "{podcast.title}",
+        "library.episode_file_template":
+            "{episode.pubdate:%Y.%m.%d} - {episode.title}",
+        "library.synchronize_interval": 60,
+
+        "player.smart_mark_seconds": 30,
+        "player.buffer_seconds": 5,
+
+        "downloads.workers": 2,
+
+        "gpodder.synchronize": False,
+        "gpodder.hostname": "gpodder.net",
+        "gpodder.username": "",
+        "gpodder.password": "",
+        "gpodder.deviceid": "{}-{}".format(__appname__.lower(), node),
+        "gpodder.devicename": "{} on {}".format(__appname__, node),
+        "gpodder.devicename_changed": False,
+        "gpodder.last_subscription_sync": 0,
+        "gpodder.last_episodes_sync": 0,
+
+        "network.connection_check_hostname": "github.com",
+    }
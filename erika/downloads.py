@@ -36,36 +36,63 @@ import time
 import requests
 
 from . import tags
-from .library.models import Config, EpisodeAction
+from .library.models import database, Config, EpisodeAction
 from .util import guess_extension
 
 # Smoothing factor used to compute the average download speed
-SMOOTHING_FACTOR = 0.01
+SMOOTHING_FACTOR = 0.05
 
-# The time step used to compute the average download speed, in seconds
-TIME_DELTA = 0.05
+# The time step used to compute the average download speed, in seconds (this
+# is also the interval between two progress updates)
+TIME_DELTA = 0.25
 
+# Size of the chunks read from the network, in bytes
+CHUNK_SIZE = 256 * 1024
 
-def download_chunks(episode):
+# Size of the buffer of the temporary file, in bytes
+BUFFER_SIZE = 1024 * 1024
+
+# Timeouts of the connection to the server and of each read, in seconds (a
+# stalled server would otherwise block a worker, which only checks if it was
+# stopped between two chunks)
+TIMEOUT = (10, 30)
+
+
+def download_chunks(episode, session=None):
     """Download an episode by chunks.
 
+    The downloaded file is moved to its final location and the episode's
+    ``local_path`` attribute is set, but the episode is not saved (see
+    :func:`finish_download`).
+
+    If a partial file was left by a previous download of the episode which
+    failed, the download is resumed when the server supports it.
+
+    Parameters
+    ----------
+    episode : Episode
+        The episode to download.
+    session : requests.Session, optional
+        The session used to make the request (reusing a session makes it
+        possible to reuse the connections to the server).
+
     Yields
     ------
     int, int
-        The size of the previous chunk, and the total size of the file.
+        The size of the previous chunk, and the total size of the file (or 0
+        if it is unknown). The first chunk is the data that was downloaded
+        before the download was resumed (its size is 0 if the download was
+        not resumed).
     """
     logger = logging.getLogger(__name__)
 
     # Start the download and get the mimetype of the file
     logger.debug("Getting file mimetype.")
-    response = requests.get(episode.file_url, stream=True)
+    get = session.get if session else requests.get
+    response = get(episode.file_url, stream=True, timeout=TIMEOUT)
     mimetype = (
         response.headers.get('content-type') or episode.mimetype
     )
-    try:
-        file_size = int(response.headers.get('content-length'))
-    except TypeError:
-        file_size = None
 
     # Set the extension of the file
     ext = guess_extension(mimetype)
@@ -75,58 +102,138 @@ def download_chunks(episode):
     dirname = os.path.dirname(filename)
 
     # Create the podcast directory if necessary
-    if not os.path.isdir(dirname):
-        os.makedirs(dirname)
+    os.makedirs(dirname, exist_ok=True)
+
+    # Resume the download if a previous one failed
+    try:
+        offset = os.path.getsize(tempfilename)
+    except FileNotFoundError:
+        offset = 0
+
+    if offset > 0:
+        logger.debug("Resuming the download at byte %d.", offset)
+        response.close()
+        response = get(episode.file_url, stream=True, timeout=TIMEOUT,
+                       headers={'Range': 'bytes={}-'.format(offset)})
+
+        if response.status_code != 206:
+            # The server does not support range requests (or the partial file
+            # is invalid), restart the download from the beginning
+            logger.debug("Unable to resume the download.")
+            offset = 0
+            if response.status_code == 416:
+                response.close()
+                response = get(episode.file_url, stream=True,
+                               timeout=TIMEOUT)
+
+    try:
+        file_size = int(response.headers.get('content-length')) + offset
+    except TypeError:
+        file_size = 0
 
     logger.debug("Downloading to temporary file '%s'.", tempfilename)
+    keep_tempfile = False
     try:
-        # Download to a temporary file
-        with open(tempfilename, "wb") as fileobj:
-            if file_size is None:
-                fileobj.write(response.content)
-            else:
-                for data in response.iter_content(chunk_size=1024):
-                    # Write the downloaded data to the temporary file
-                    fileobj.write(data)
-                    chunk_size = len(data)
+        yield (offset, file_size)
 
-                    yield (chunk_size, file_size)
+        # Download to a temporary file
+        mode = "ab" if offset > 0 else "wb"
+        with open(tempfilename, mode, buffering=BUFFER_SIZE) as fileobj:
+            for data in response.iter_content(chunk_size=CHUNK_SIZE):
+                # Write the downloaded data to the temporary file
+                fileobj.write(data)
+                chunk_size = len(data)
+
+                yield (chunk_size, file_size)
+
+            # The file will not be read again soon, tell the kernel that it
+            # can evict it from the page cache (this is only a hint, the
+            # pages which have not been written to the disk yet are kept)
+            if hasattr(os, 'posix_fadvise'):
+                fileobj.flush()
+                os.posix_fadvise(fileobj.fileno(), 0, 0,
+                                 os.POSIX_FADV_DONTNEED)
 
         # Move the temporary file to the destination file
-        os.rename(tempfilename, filename)
-
-        # Set the tags of the downloaded file
-        tags.set_tags(filename, episode)
+        os.replace(tempfilename, filename)
 
         episode.absolute_local_path = filename
-        episode.save()
-
-        action = EpisodeAction(episode=episode, action="download")
-        action.save()
+    except requests.exceptions.RequestException:
+        # Keep the temporary file to be able to resume the download
+        keep_tempfile = True
+        raise
     finally:
-        # Remove the temporary file if it exists (if the download failed or was
-        # canceled)
-        if os.path.isfile(tempfilename):
-            os.remove(tempfilename)
+        # Remove the temporary file if it exists (if the download was canceled
+        # or failed for another reason than a network error)
+        if not keep_tempfile:
+            try:
+                os.remove(tempfilename)
+            except FileNotFoundError:
+                pass
+
 
+def tag_download(episode):
+    """Set the tags of a downloaded episode file.
+
+    Parameters
+    ----------
+    episode : Episode
+        An episode downloaded with :func:`download_chunks`.
+    """
+    tags.set_tags(episode.absolute_local_path, episode)
+
+
+def save_download(episode):
+    """Save a downloaded episode in the database.
+
+    Parameters
+    ----------
+    episode : Episode
+        An episode downloaded with :func:`download_chunks`.
+    """
+    episode.save()
 
-def download_with_average_speed(episode):
+    action = EpisodeAction(episode=episode, action="download")
+    action.save()
+
+
+def finish_download(episode):
+    """Set the tags of a downloaded episode file and save the episode in the
+    database.
+
+    Parameters
+    ----------
+    episode : Episode
+        An episode downloaded with :func:`download_chunks`.
+    """
+    tag_download(episode)
+    save_download(episode)
+
+
+def download_with_average_speed(episode, session=None):
     """Download an episode by chunks, and compute the average speed (see
     https://en.wikipedia.org/wiki/Moving_average#Exponential_moving_average).
 
+    See :func:`download_chunks` for the parameters.
+
     Yields
     ------
     int, int, float
         - The current downloaded size in bytes;
-        - the total file size in bytes;
+        - the total file size in bytes (or 0 if it is unknown);
         - the average downloading speed in bytes per second.
     """
+    chunks = download_chunks(episode, session)
+
+    # The size of the data downloaded before the download was resumed, which
+    # should not be taken into account in the average speed
+    current_size, _ = next(chunks)  # Total downloaded size
+
     previous_time = time.time()  # Time of the previous step
-    current_size = 0  # Total downloaded size
     step_size = 0  # Size downloaded during the current time step
-    average_speed = 0  # Average download speed
+    average_speed = None  # Average download speed
 
-    for chunk_size, file_size in download_chunks(episode):
+    for chunk_size, file_size in chunks:
         now = time.time()
 
         current_size += chunk_size
@@ -137,12 +244,11 @@ def download_with_average_speed(episode):
             current_speed = step_size / (now - previous_time)
 
             # Compute the smoothed average download speed
-            if average_speed == 0:
+            if average_speed is None:
                 average_speed = current_speed
             else:
-                average_speed = (
-                    SMOOTHING_FACTOR * current_speed +
-                    (1 - SMOOTHING_FACTOR) * average_speed)
+                average_speed += SMOOTHING_FACTOR * (
+                    current_speed - average_speed)
 
             yield (current_size, file_size, average_speed)
 
@@ -152,15 +258,23 @@ def download_with_average_speed(episode):
 
 class DownloadsPool(object):
     """Download pool, handling the downloads queue and the workers to make
-    concurrent downloads possible."""
+    concurrent downloads possible.
+
+    The workers share a single queue, so that a job is executed by the first
+    idle worker. Each worker keeps its own session, reusing its connections
+    between the jobs it executes."""
     def __init__(self):
         self.queue = Queue()
+        self.finish_queue = Queue()
 
-        workers = Config.get_value("downloads.workers")
+        # At least one worker is needed for the downloads to be made
+        workers = max(1, Config.get_cached_value("downloads.workers"))
 
         self.workers = [
-            DownloadWorker(self.queue) for _ in range(0, workers)
+            DownloadWorker(self.queue, self.finish_queue)
+            for _ in range(0, workers)
         ]
+        self.finish_worker = FinishWorker(self.finish_queue)
 
     def add(self, job):
         """Add a new job to the queue.
@@ -169,50 +283,166 @@ class DownloadsPool(object):
 
         - a ``cancel`` method, which stops the job cleanly and as soon as
           possible;
-        - a ``start`` method, which starts the job.
+        - a ``start`` method, which starts the job, and takes as parameter
+          the :class:`requests.Session` of the worker executing it. It should
+          return True if the job was completed;
+        - a ``prepare`` method, which is called in a separate thread once
+          the job is completed, in order to free the worker for the next job
+          as soon as possible. It should do the work that does not touch the
+          database (e.g. writing the tags of the downloaded file);
+        - a ``save`` method, which is then called in the same thread, inside
+          a database transaction which may be shared with other completed
+          jobs;
+        - a ``finish`` method, which is called once this transaction has
+          been committed, if the job was saved successfully.
 
         See :class:`erika.frontend.downloads.DownloadJob` for an example.
         """
         self.queue.put(job)
 
     def stop(self):
-        """Stop all the workers (and the jobs being currently executed)."""
+        """Stop all the workers (and the jobs being currently executed).
+
+        The method does not wait for the workers to exit, in order not to
+        block the main loop until their current jobs are canceled."""
         for worker in self.workers:
             worker.stop()
 
+        # Wake up the idle workers
+        for _ in self.workers:
+            self.queue.put(None)
+
+        Thread(target=self._stop_finish_worker).start()
+
+    def _stop_finish_worker(self):
+        """Wait for the download workers to exit, so that no job can be added
+        to the finish queue after the sentinel, and stop the finish worker
+        once the completed jobs are finished"""
+        for worker in self.workers:
+            worker.join()
+
+        self.finish_queue.put(None)
+
 
 class DownloadWorker(Thread):
-    """Thread waiting for jobs to be added to the queue and executing them."""
-    def __init__(self, queue):
+    """Thread waiting for jobs to be added to the queue and executing them.
+
+    The worker blocks until a job is available, and exits when it gets None
+    from the queue (see :meth:`DownloadsPool.stop`)."""
+    def __init__(self, queue, finish_queue):
         Thread.__init__(self)
 
         self.logger = logging.getLogger(
             "{}.{}".format(__name__, self.__class__.__name__))
 
         self.queue = queue
+        self.finish_queue = finish_queue
         self.stopped = False
         self.current_job = None
 
+        # Session shared by the jobs executed by this worker, in order to
+        # reuse the connections
+        self.session = requests.Session()
+        # The episodes are already compressed
+        self.session.headers['Accept-Encoding'] = 'identity'
+
         self.start()
 
     def run(self):
         while not self.stopped:
-            try:
-                self.current_job = self.queue.get(timeout=1)
-            except Empty:
-                continue
+            self.current_job = self.queue.get()
+            if self.current_job is None or self.stopped:
+                # The pool is being stopped
+                self.current_job = None
+                self.queue.task_done()
+                break
 
             try:
-                self.current_job.start()
+                if self.current_job.start(self.session):
+                    self.finish_queue.put(self.current_job)
             except Exception:  # pylint: disable=broad-except
                 self.logger.exception("Download failed.")
             finally:
                 self.current_job = None
                 self.queue.task_done()
 
+        self.session.close()
+
     def stop(self):
         """Stop the worker (and the job being currently executed)."""
         self.stopped = True
-        if self.current_job:
-            self.current_job.cancel()
-            self.current_job = None
+
+        # The worker thread may reset current_job at any moment
+        job = self.current_job
+        if job is not None:
+            job.cancel()
+
+
+class FinishWorker(Thread):
+    """Thread calling the ``prepare``, ``save`` and ``finish`` methods of the
+    jobs completed by the download workers.
+
+    The jobs that are completed while the worker is busy are saved in a
+    single database transaction, each one in its own savepoint so that a
+    failing job does not prevent the others from being saved. The worker
+    exits when it gets None from the queue (see :meth:`DownloadsPool.stop`).
+    """
+    def __init__(self, queue):
+        Thread.__init__(self)
+
+        self.logger = logging.getLogger(
+            "{}.{}".format(__name__, self.__class__.__name__))
+
+        self.queue = queue
+
+        self.start()
+
+    def run(self):
+        stopped = False
+        while not stopped:
+            # Get the jobs which are waiting in the queue
+            jobs = [self.queue.get()]
+            while True:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            count = len(jobs)
+            if None in jobs:
+                stopped = True
+                jobs = [job for job in jobs if job is not None]
+
+            try:
+                for job in jobs:
+                    try:
+                        job.prepare()
+                    except Exception:  # pylint: disable=broad-except
+                        # The file is downloaded, save the job anyway
+                        self.logger.exception("Unable to prepare a download.")
+
+                saved = []
+                try:
+                    with database.atomic():
+                        for job in jobs:
+                            try:
+                                with database.atomic():
+                                    job.save()
+                            except Exception:  # pylint: disable=broad-except
+                                self.logger.exception(
+                                    "Unable to save a download.")
+                            else:
+                                saved.append(job)
+                except Exception:  # pylint: disable=broad-except
+                    self.logger.exception("Unable to save the downloads.")
+                    saved = []
+
+                for job in saved:
+                    try:
+                        job.finish()
+                    except Exception:  # pylint: disable=broad-except
+                        self.logger.exception(
+                            "Unable to finish a download.")
+            finally:
+                for _ in range(count):
+                    self.queue.task_done()
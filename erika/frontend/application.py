@@ -22,9 +22,11 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import logging
 import threading
+import time
 from gi.repository import Gio
 from gi.repository import GLib
 from gi.repository import GObject
@@ -32,6 +34,7 @@ from gi.repository import Gtk
 
 from erika import library
 from erika.config import DEFAULT_CONFIG_DIRECTORY
+from erika.downloads import DownloadsPool
 from erika.library.models import Config, Episode, Podcast
 from erika.library.opml import import_opml, export_opml
 from erika.library.gpodder import GPodderClient, GPodderUnauthorized
@@ -40,6 +43,13 @@ from . import preferences
 from .main_window import MainWindow
 from .util import cb, get_builder
 
+# Maximal number of updated podcasts, and maximal time in seconds, between two
+# updates of the podcast list during the synchronization
+UPDATE_BATCH_SIZE = 16
+UPDATE_BATCH_DELAY = 0.2
+# Number of podcasts fetched concurrently during synchronization
+UPDATE_WORKERS = 8
+
 
 class Application(Gtk.Application):
     """
@@ -63,6 +73,7 @@ class Application(Gtk.Application):
             "{}.{}".format(__name__, self.__class__.__name__))
 
         self.window = None
+        self.downloads_pool = None
         self.online = True
         self.configuration_directory = DEFAULT_CONFIG_DIRECTORY
         self.synchronization_lock = threading.Lock()
@@ -87,6 +98,10 @@ class Application(Gtk.Application):
 
         Gtk.Application.do_startup(self)
 
+        # Executor used to run the background tasks
+        self.executor = ThreadPoolExecutor(max_workers=4,
+                                           thread_name_prefix='erika-bg')
+
         # Creates the actions
         self.add_podcast_action = Gio.SimpleAction.new("add-podcast", None)
         self.add_podcast_action.connect("activate", cb(self.add_podcast, 2))
@@ -159,6 +174,9 @@ class Application(Gtk.Application):
         # Connect to the database
         library.initialize(self.configuration_directory)
 
+        # Create the pool of download workers, shared by the whole application
+        self.downloads_pool = DownloadsPool()
+
         # Create the main window
         try:
             self.window = MainWindow(self)
@@ -198,6 +216,11 @@ class Application(Gtk.Application):
 
     def _on_shutdown(self):
         """Called when the application is closed"""
+        self.executor.shutdown(wait=False)
+
+        if self.downloads_pool is not None:
+            self.downloads_pool.stop()
+
         if self.window is None:
             return
 
@@ -229,7 +252,8 @@ class Application(Gtk.Application):
                 return
 
             # Check internet connection
-            hostname = Config.get_value("network.connection_check_hostname")
+            hostname = Config.get_cached_value(
+                "network.connection_check_hostname")
             if not check_connection(hostname):
                 self.set_network_state(False, error=True)
                 return
@@ -256,10 +280,34 @@ class Application(Gtk.Application):
                 GObject.idle_add(self.window.statusbox.edit,
                                  message_id, "Updating library...")
 
-                for podcast in Podcast.select():
-                    podcast.update_podcast()
+                # Fetch the podcasts concurrently, save them in this thread
+                # as soon as they are fetched, and update the podcast list by
+                # batches
+                batch = []
+                batch_time = time.time()
+                with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as pool:
+                    futures = {
+                        pool.submit(podcast.fetch_update): podcast
+                        for podcast in Podcast.select()
+                    }
+
+                    for future in as_completed(futures):
+                        podcast = futures[future]
+                        podcast.save_update(future.result())
+                        batch.append(podcast)
+
+                        elapsed = time.time() - batch_time
+                        if (len(batch) >= UPDATE_BATCH_SIZE or
+                                elapsed >= UPDATE_BATCH_DELAY):
+                            GObject.idle_add(
+                                self.window.podcast_list.update_podcasts,
+                                batch)
+                            batch = []
+                            batch_time = time.time()
+
+                if batch:
                     GObject.idle_add(
-                        self.window.podcast_list.update_podcast, podcast)
+                        self.window.podcast_list.update_podcasts, batch)
 
             if update and scan:
                 GObject.idle_add(self.window.statusbox.edit,
@@ -329,8 +377,7 @@ class Application(Gtk.Application):
 
             GObject.idle_add(_end)
 
-        thread = threading.Thread(target=_add, args=(url,))
-        thread.start()
+        self.executor.submit(_add, url)
 
     def import_opml(self):
         """
@@ -384,8 +431,7 @@ class Application(Gtk.Application):
 
             GObject.idle_add(_end)
 
-        thread = threading.Thread(target=_import, args=(filename,))
-        thread.start()
+        self.executor.submit(_import, filename)
 
     def export_opml(self):
         """
@@ -418,16 +464,29 @@ class Application(Gtk.Application):
 
             GObject.idle_add(_end)
 
-        thread = threading.Thread(target=_export, args=(filename,))
-        thread.start()
+        self.executor.submit(_export, filename)
 
     def set_network_state(self, online=True, error=False):
+        """Set the network state of the application
+
+        If online is True, the connection is checked in a background thread
+        before the state is changed.
+        """
         if online and not error:
-            hostname = Config.get_value("network.connection_check_hostname")
-            error = not check_connection(hostname)
-        if error:
-            online = False
+            self.executor.submit(self._check_connection)
+            return
+
+        self._apply_network_state(False, error)
+
+    def _check_connection(self):
+        """Check the internet connection and update the network state
+        accordingly. Called in a background thread."""
+        hostname = Config.get_cached_value("network.connection_check_hostname")
+        error = not check_connection(hostname)
+        GObject.idle_add(self._apply_network_state, not error, error)
 
+    def _apply_network_state(self, online, error):
+        """Set the network state of the application"""
         self.online = online
 
         self.add_podcast_action.set_enabled(online)
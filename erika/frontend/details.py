@@ -26,60 +26,224 @@
 Widget displaying the details of a podcast or episode
 """
 
-import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
 import pkgutil
 
 from gi.repository import Gtk
-from gi.repository import GObject
+from gi.repository import GLib
 from gi.repository import Gio
 
+from erika.frontend.util import idle_call
 from erika.frontend.widgets import WebView
 
+# Thread rendering the templates (which requires encoding the images)
+_RENDER_POOL = ThreadPoolExecutor(max_workers=1,
+                                  thread_name_prefix='erika-render')
+# Pool of threads downloading the images of the episodes
+_IMAGE_POOL = ThreadPoolExecutor(max_workers=4,
+                                 thread_name_prefix='erika-images')
+# Pool of threads prefetching the images of the episodes that are likely to be
+# shown next
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=2,
+                                    thread_name_prefix='erika-prefetch')
+
+
+@lru_cache(maxsize=None)
+def _load_template(name):
+    """Load an html template from the data directory the first time it is
+    needed.
+
+    The head of the template (containing the stylesheet) does not depend on
+    the episode or podcast, so it is formatted once here, and only the body
+    is formatted by :func:`_render_template`.
+
+    Parameters
+    ----------
+    name : str
+        The filename of the template.
+
+    Returns
+    -------
+    str
+        The formatted head of the template.
+    str
+        The body of the template.
+    """
+    template = pkgutil.get_data(
+        'erika.frontend', 'data/{}'.format(name)
+    ).decode('utf-8')
+
+    index = template.index("<body>")
+    return template[:index].format(), template[index:]
+
+
+def _render_template(name, **kwargs):
+    """Render an html template.
+
+    Parameters
+    ----------
+    name : str
+        The filename of the template.
+    kwargs
+        The arguments used to format the template.
+
+    Returns
+    -------
+    str
+        The html document.
+    """
+    head, body = _load_template(name)
+    return head + body.format(**kwargs)
+
 
 class Details(Gtk.ScrolledWindow):
     """Widget displaying the details of a podcast or episode"""
-    EPISODE_TEMPLATE = pkgutil.get_data(
-        'erika.frontend', 'data/episode_details_template.html'
-    ).decode('utf-8')
-    PODCAST_TEMPLATE = pkgutil.get_data(
-        'erika.frontend', 'data/podcast_details_template.html'
-    ).decode('utf-8')
-
     def __init__(self):
         super().__init__()
 
-        self.current = None  # Current episode or podcast being shown
-
-        self.view = WebView()
-        self.add(self.view)
-
-    def show_episode(self, episode, get_image=True):
-        """Show the details of an episode"""
-        self.current = episode
+        self.logger = logging.getLogger(
+            "{}.{}".format(__name__, self.__class__.__name__))
 
-        html = self.EPISODE_TEMPLATE.format(episode=episode)
-        self.view.load_html_string(html, "")
+        self.current = None  # Current episode or podcast being shown
+        self.html = None  # Html currently loaded in the view
+        self.image_future = None  # Download of the current episode's image
+        self.prefetch_futures = []
+
+        # The view is only created when something is shown, as it is the
+        # most expensive widget of the application
+        self.view = None
+
+    def show_episode(self, episode, get_image=True, force=False):
+        """Show the details of an episode
+
+        Parameters
+        ----------
+        episode : :class:`Episode`
+            The episode.
+        get_image : bool, optional
+            If True, download the episode's image if it is not available.
+        force : bool, optional
+            If True, show the details even if the episode is already being
+            shown (e.g. to update them).
+        """
+        if episode == self.current and not force:
+            return
+
+        self._set_current(episode)
+
+        self._render('episode_details_template.html', episode=episode)
 
         # If the image is not available, download it in a thread, and
         # update the view at the end
-        application = Gio.Application.get_default()
-        if all((get_image,
-                not episode.image_downloaded,
-                application.get_online())):
+        if (get_image and
+                not episode.image_downloaded and
+                Gio.Application.get_default().get_online()):
             def _end():
                 if episode == self.current:
-                    self.show_episode(episode, get_image=False)
+                    self.show_episode(episode, get_image=False, force=True)
+
+            self.image_future = _IMAGE_POOL.submit(episode.get_image)
+            self.image_future.add_done_callback(
+                lambda future: idle_call(_end))
+
+    def show_podcast(self, podcast, force=False):
+        """Show the details of a podcast
+
+        Parameters
+        ----------
+        podcast : :class:`Podcast`
+            The podcast.
+        force : bool, optional
+            If True, show the details even if the podcast is already being
+            shown (e.g. to update them).
+        """
+        if podcast == self.current and not force:
+            return
+
+        self._set_current(podcast)
+
+        self._render('podcast_details_template.html', podcast=podcast)
+
+    def prefetch_images(self, episodes):
+        """Download the images of episodes that are likely to be shown next
+        (e.g. the ones next to the current episode in the list), once the
+        application is idle.
+
+        Parameters
+        ----------
+        episodes : list of :class:`Episode`
+            The episodes.
+        """
+        GLib.idle_add(self._prefetch_images, episodes,
+                      priority=GLib.PRIORITY_LOW)
+
+    def _prefetch_images(self, episodes):
+        # Cancel the previous prefetches that have not started yet
+        for future in self.prefetch_futures:
+            future.cancel()
+        self.prefetch_futures = []
 
-            def _thread():
-                episode.get_image()
-                GObject.idle_add(_end)
-
-            thread = threading.Thread(target=_thread)
-            thread.start()
-
-    def show_podcast(self, podcast):
-        """Show the details of a podcast"""
-        self.current = podcast
-
-        html = self.PODCAST_TEMPLATE.format(podcast=podcast)
-        self.view.load_html_string(html, "")
+        application = Gio.Application.get_default()
+        if not application.get_online():
+            return
+
+        self.prefetch_futures = [
+            _PREFETCH_POOL.submit(episode.get_image)
+            for episode in episodes
+            if episode.image_url and not episode.image_downloaded
+        ]
+
+    def _set_current(self, current):
+        """Set the episode or podcast being shown, and cancel the download of
+        the previous episode's image if it has not started yet"""
+        if current != self.current and self.image_future is not None:
+            self.image_future.cancel()
+            self.image_future = None
+
+        self.current = current
+
+    def _render(self, name, **kwargs):
+        """Render a template in a separate thread, and load the result in the
+        view if the episode or podcast is still being shown at the end.
+
+        Parameters
+        ----------
+        name : str
+            The filename of the template.
+        kwargs
+            The arguments used to format the template.
+        """
+        current = self.current
+
+        future = _RENDER_POOL.submit(_render_template, name, **kwargs)
+        future.add_done_callback(
+            lambda future: idle_call(self._on_rendered, current, future))
+
+    def _on_rendered(self, current, future):
+        """Called in the main thread when a template is rendered"""
+        if current != self.current:
+            return
+
+        try:
+            html = future.result()
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception("Unable to render the details.")
+            return
+
+        self._load_html(html)
+
+    def _load_html(self, html):
+        """Load html in the view, unless it is already displayed"""
+        if html == self.html:
+            return
+
+        self.html = html
+
+        if self.view is None:
+            self.view = WebView()
+            self.view.show()
+            self.add(self.view)
+
+        self.view.load_html(html)
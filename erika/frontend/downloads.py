@@ -26,14 +26,19 @@
 Button displaying the list downloads and their progress
 """
 
+from functools import lru_cache
 import logging
+from threading import Lock
 
+from gi.repository import Gio
 from gi.repository import GObject
 from gi.repository import Gtk
 from gi.repository import GLib
 
-from erika.downloads import DownloadsPool, download_with_average_speed
+from erika.downloads import (download_with_average_speed, tag_download,
+                             save_download)
 from erika.util import format_fulltext_duration, format_size
+from .util import idle_call
 from .widgets import Label, ScrolledWindow, IndexedListBox
 
 # Size of the episode icon in the download list
@@ -43,6 +48,45 @@ IMAGE_SIZE = 64
 POPOVER_WIDTH = 500
 POPOVER_HEIGHT = 400
 
+# Icons of the podcasts in the download list, indexed by podcast id
+_ICONS = {}
+
+
+@lru_cache(maxsize=512)
+def _escape(text):
+    """Escape a text for use in markup (memoized, as podcast titles are
+    shared by many episodes)"""
+    return GLib.markup_escape_text(text)
+
+
+def _get_icon(podcast):
+    """Return the icon of a podcast in the download list.
+
+    The icons are shared by the rows of the podcast's episodes, and are
+    only updated when the podcast's image changes.
+
+    Parameters
+    ----------
+    podcast : :class:`Podcast`
+        The podcast.
+
+    Returns
+    -------
+    GdkPixbuf.Pixbuf
+    """
+    image_hash = hash(podcast.image.data)
+    try:
+        cached_hash, pixbuf = _ICONS[podcast.id]
+    except KeyError:
+        pass
+    else:
+        if cached_hash == image_hash:
+            return pixbuf
+
+    pixbuf = podcast.image.as_pixbuf(IMAGE_SIZE)
+    _ICONS[podcast.id] = (image_hash, pixbuf)
+    return pixbuf
+
 
 class DownloadsButton(Gtk.MenuButton):
     """Button displaying the list of downloads
@@ -64,7 +108,10 @@ class DownloadsButton(Gtk.MenuButton):
         self.logger = logging.getLogger(
             "{}.{}".format(__name__, self.__class__.__name__))
 
-        self.pool = DownloadsPool()
+        self.pool = Gio.Application.get_default().downloads_pool
+
+        # Ids of the episodes in the download list
+        self.episode_ids = set()
 
         self.set_image(Gtk.Image.new_from_icon_name(
             "document-save-symbolic", Gtk.IconSize.BUTTON))
@@ -74,8 +121,8 @@ class DownloadsButton(Gtk.MenuButton):
 
         self.listbox = IndexedListBox()
         self.listbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        self.listbox.connect("add", self._on_list_changed)
-        self.listbox.connect("remove", self._on_list_changed)
+        self.listbox.connect("add", self._on_row_added)
+        self.listbox.connect("remove", self._on_row_removed)
         self.listbox.show()
 
         scrolled_window = ScrolledWindow()
@@ -98,7 +145,7 @@ class DownloadsButton(Gtk.MenuButton):
 
     def download(self, episode):
         """Add an episode to the download queue"""
-        if episode.id in self.listbox.get_ids():
+        if episode.id in self.episode_ids:
             self.logger.debug("The episode is already in the download list.")
             return
 
@@ -110,13 +157,20 @@ class DownloadsButton(Gtk.MenuButton):
 
         self.pool.add(job)
 
-    def stop(self):
-        """Cancel all the downloads"""
-        self.pool.stop()
+    def _on_row_added(self, listbox, row):
+        """Called when a row is added to the list"""
+        self.episode_ids.add(row.job.episode.id)
+        self.set_sensitive(True)
+
+    def _on_row_removed(self, listbox, row):
+        """Called when a row is removed from the list"""
+        episode_id = row.job.episode.id
+        self.episode_ids.discard(episode_id)
 
-    def _on_list_changed(self, listbox, child):
-        """Called when a child is added to or removed from the list"""
-        self.set_sensitive(bool(listbox.get_children()))
+        # The rows destroy themselves, so the index of the listbox needs to
+        # be updated for the episode to be downloaded again
+        self.listbox.discard_id(episode_id)
+        self.set_sensitive(bool(self.episode_ids))
 
     def _on_episode_updated(self, row, episode):
         """Called at the end of the download of an episode
@@ -145,9 +199,14 @@ class DownloadRow(Gtk.ListBoxRow):
 
         self.job = job
         self.job.connect("start", self._on_start)
-        self.job.connect("progress", self._on_progress)
+        self.progress_handler = self.job.connect("progress",
+                                                 self._on_progress)
         self.job.connect("remove", self._on_remove)
 
+        # Total size of the file, which is only formatted once
+        self.totalsize = None
+        self.totalsize_text = None
+
         # Layout
         self.grid = Gtk.Grid()
         self.grid.set_column_spacing(5)
@@ -179,10 +238,22 @@ class DownloadRow(Gtk.ListBoxRow):
 
     def _on_start(self, job):
         """Update the widget to show that the download is starting"""
-        self.progress_label.set_text("Starting...")
+        self._set_progress_text("Starting...")
 
     def _on_progress(self, job, currentsize, totalsize, speed):
         """Update the widget to show the current download progress"""
+        if not totalsize:
+            # The size of the file is unknown
+            self.progress.pulse()
+            self._set_progress_text("{} ({}/s)".format(
+                format_size(currentsize), format_size(speed)
+            ))
+            return
+
+        if totalsize != self.totalsize:
+            self.totalsize = totalsize
+            self.totalsize_text = format_size(totalsize)
+
         try:
             remaining_time = int(round((totalsize - currentsize) / speed))
         except ZeroDivisionError:
@@ -190,34 +261,47 @@ class DownloadRow(Gtk.ListBoxRow):
 
         self.progress.set_fraction(currentsize / totalsize)
         if remaining_time is None:
-            self.progress_label.set_text("{} of {} ({}/s)".format(
-                format_size(currentsize), format_size(totalsize),
+            self._set_progress_text("{} of {} ({}/s)".format(
+                format_size(currentsize), self.totalsize_text,
                 format_size(speed)
             ))
         else:
-            self.progress_label.set_text(
+            self._set_progress_text(
                 "{} - {} of {} ({}/s)".format(
                     format_fulltext_duration(remaining_time),
-                    format_size(currentsize), format_size(totalsize),
+                    format_size(currentsize), self.totalsize_text,
                     format_size(speed)
                 ))
 
+    def _set_progress_text(self, text):
+        """Set the text of the progress label, unless it did not change (which
+        would needlessly relayout the label)"""
+        if text != self.progress_label.get_text():
+            self.progress_label.set_text(text)
+
     def _on_remove(self, job):
         """Remove the download from the list"""
+        # The job may be removed twice (e.g. canceled after being saved)
+        if self.progress_handler is None:
+            return
+
+        # A progress update may still be pending
+        self.job.disconnect(self.progress_handler)
+        self.progress_handler = None
+
         self.emit("episode-updated", self.job.episode)
         self.destroy()
 
     def set_pending(self):
         """Update the widget to show the download is pending"""
-        self.icon.set_from_pixbuf(
-            self.job.episode.podcast.image.as_pixbuf(IMAGE_SIZE))
+        self.icon.set_from_pixbuf(_get_icon(self.job.episode.podcast))
 
         self.title.set_markup(
             "{} - <i>{}</i>".format(
-                GLib.markup_escape_text(self.job.episode.title),
-                GLib.markup_escape_text(self.job.episode.podcast.title)))
+                _escape(self.job.episode.title),
+                _escape(self.job.episode.podcast.title)))
 
-        self.progress_label.set_text("Pending...")
+        self._set_progress_text("Pending...")
 
     def _on_cancel_clicked(self, button):
         """Called when the cancel button is clicked"""
@@ -235,7 +319,8 @@ class DownloadJob(GObject.Object):
         Emitted when the download should be removed from the list (e.g. removed
         or canceled).
     progress(current_size, total_size, speed)
-        Emitted during the download to report its progress.
+        Emitted during the download to report its progress (total_size is 0
+        if the size of the file is unknown).
     """
 
     __gsignals__ = {
@@ -253,23 +338,71 @@ class DownloadJob(GObject.Object):
         self.episode = episode
         self.canceled = False
 
+        # Latest progress which has not been emitted yet
+        self.progress = None
+        self.progress_lock = Lock()
+
     def cancel(self):
         """Cancel the download"""
         self.canceled = True
-        GObject.idle_add(self.emit, "remove")
+        idle_call(self.emit, "remove")
+
+    def start(self, session):
+        """Start the download
 
-    def start(self):
-        """Start the download"""
-        GObject.idle_add(self.emit, "start")
+        Parameters
+        ----------
+        session : requests.Session
+            The session used to download the episode.
+
+        Returns
+        -------
+        bool
+            True if the download was completed, False if it was canceled.
+        """
+        idle_call(self.emit, "start")
 
-        generator = download_with_average_speed(self.episode)
+        generator = download_with_average_speed(self.episode, session)
 
         for current_size, file_size, average_speed in generator:
             if self.canceled:
                 generator.close()
-                return
+                return False
+
+            self._post_progress(current_size, file_size, average_speed)
+
+        return True
+
+    def _post_progress(self, current_size, file_size, average_speed):
+        """Schedule the emission of the progress signal in the main thread.
+
+        If the main loop did not emit the previous progress yet, it is simply
+        replaced by the new one instead of scheduling another callback."""
+        with self.progress_lock:
+            scheduled = self.progress is not None
+            self.progress = (current_size, file_size, average_speed)
+
+        if not scheduled:
+            # The progress is less urgent than the user's interactions and the
+            # other signals of the job
+            GLib.idle_add(self._emit_progress, priority=GLib.PRIORITY_LOW)
+
+    def _emit_progress(self):
+        with self.progress_lock:
+            progress = self.progress
+            self.progress = None
+
+        self.emit("progress", *progress)
+
+    def prepare(self):
+        """Set the tags of the downloaded file"""
+        tag_download(self.episode)
 
-            GObject.idle_add(self.emit, "progress", current_size, file_size,
-                             average_speed)
+    def save(self):
+        """Save the downloaded episode"""
+        save_download(self.episode)
 
-        GObject.idle_add(self.emit, "remove")
+    def finish(self):
+        """Remove the download from the list once it has been saved"""
+        if not self.canceled:
+            idle_call(self.emit, "remove")
@@ -26,20 +26,52 @@
 List of episodes
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
 from gi.repository import GObject
 from gi.repository import GLib
 from gi.repository import Gtk
 from gi.repository import Gst
 from gi.repository import Gio
+from peewee import chunked
 
 from erika.library.models import database, Episode, EpisodeAction
 from erika.util import format_duration
-from .widgets import Label, IndexedListBox, FilterButton, SortButton
+from .widgets import (Label, IndexedListBox, FilterButton, SortButton,
+                      is_visible)
 from .player import Player
-from .util import cb
+from .util import cb, escape_markup, idle_call
 
 SUBTITLE_LINES = 4
 CHUNK_SIZE = 10
+# Maximal number of rows inserted or updated by a single query (SQLite limits
+# the number of parameters of a query)
+SAVE_BATCH_SIZE = 100
+
+# Thread saving the modifications of the episodes (a single thread is used,
+# since SQLite only supports one writer at a time)
+_DATABASE_EXECUTOR = ThreadPoolExecutor(max_workers=1,
+                                        thread_name_prefix='erika-db')
+
+# Clauses used to sort the episodes by publication date
+PUBDATE_ASCENDING = Episode.pubdate.asc()
+PUBDATE_DESCENDING = Episode.pubdate.desc()
+
+# Flags of the actions of the context menu that are possible for an episode
+# (see EpisodeRow.actions)
+ACTION_DOWNLOAD = 1
+ACTION_MARK_AS_PLAYED = 2
+ACTION_MARK_AS_UNPLAYED = 4
+ACTION_RESET_PROGRESS = 8
+ALL_ACTIONS = 15
+
+# Icons shared by all the rows
+ICON_NEW = Gio.ThemedIcon.new("erika-episode-new")
+ICON_OLD = Gio.ThemedIcon.new("erika-episode-old")
+ICON_DOWNLOAD = Gio.ThemedIcon.new("document-save-symbolic")
+ICON_PLAY = Gio.ThemedIcon.new("media-playback-start-symbolic")
+ICON_PAUSE = Gio.ThemedIcon.new("media-playback-pause-symbolic")
 
 
 class EpisodeList(Gtk.VBox):
@@ -67,15 +99,23 @@ class EpisodeList(Gtk.VBox):
     def __init__(self, player):
         Gtk.VBox.__init__(self)
 
+        self.logger = logging.getLogger(
+            "{}.{}".format(__name__, self.__class__.__name__))
+
         self.current_podcast = None
         self.update_id = None
 
         self.player = player
 
+        # Handlers of the "clicked" signals of the buttons of the rows, shared
+        # by all the rows (which are passed as user data)
+        self._on_toggle_clicked = cb(self._toggle)
+        self._on_download_clicked = cb(self._download)
+
         # Episode list
         self.listbox = IndexedListBox()
         self.listbox.set_selection_mode(Gtk.SelectionMode.MULTIPLE)
-        self.listbox.set_sort_func(self.sort_func)
+        self.listbox.set_sort_func(self.sort_descending)
         self.listbox.set_filter_func(self.filter_func)
         self.listbox.connect("popup-menu", self._on_popup_menu)
         self.listbox.connect("selected-rows-changed",
@@ -103,10 +143,19 @@ class EpisodeList(Gtk.VBox):
         filter_downloaded.connect("toggled",
                                   cb(self.listbox.invalidate_filter))
 
+        # The filters should be in the same order as EpisodeRow.flags
         self.filters = [filter_new, filter_played, filter_downloaded]
 
+        # Clauses used to put the episodes that are not shown by a filter at
+        # the end of the query, indexed by filter button and state
+        self.filter_order_clauses = {}
+        for filter_button in self.filters:
+            field = filter_button.key(Episode)
+            self.filter_order_clauses[filter_button, True] = field.desc()
+            self.filter_order_clauses[filter_button, False] = field.asc()
+
         self.sort = SortButton("publication date")
-        self.sort.connect("clicked", cb(self.listbox.invalidate_sort))
+        self.sort.connect("clicked", self._on_sort_clicked)
 
         # Layout
         action_bar.pack_start(filter_new)
@@ -121,6 +170,10 @@ class EpisodeList(Gtk.VBox):
         self.application.connect('network-state-changed',
                                  cb(self.set_network_state))
 
+        # Network state passed to the rows by the last call to
+        # set_network_state
+        self.online = None
+
     def select(self, podcast):
         """Display the episodes of a podcast
 
@@ -129,6 +182,14 @@ class EpisodeList(Gtk.VBox):
         podcast : Podcast
             The podcast whose episodes will be displayed
         """
+        current_podcast = self.current_podcast
+        if (current_podcast is not None and podcast is not None and
+                current_podcast.id == podcast.id):
+            # The episodes are already displayed (the modifications of the
+            # database are followed by calls to update)
+            self.current_podcast = podcast
+            return
+
         self.current_podcast = podcast
 
         # Remove children
@@ -145,27 +206,34 @@ class EpisodeList(Gtk.VBox):
 
             episodes = self.current_podcast.episodes
 
-            order_clauses = []
-
             # Put the results that are not shown at the end (so that
             # they can be shown if the user changes the filter, but do
             # not delay the display of the ones that are currently
             # visible)
-            for filter_button in self.filters:
-                if filter_button.state is True:
-                    order_clauses.append(filter_button.key(Episode).desc())
-                elif filter_button.state is False:
-                    order_clauses.append(filter_button.key(Episode).asc())
+            order_clauses = [
+                self.filter_order_clauses[filter_button, filter_button.state]
+                for filter_button in self.filters
+                if filter_button.state is not None
+            ]
 
             # Sort by date
             if self.sort.get_descending():
-                order_clauses.append(Episode.pubdate.desc())
+                order_clauses.append(PUBDATE_DESCENDING)
             else:
-                order_clauses.append(Episode.pubdate.asc())
+                order_clauses.append(PUBDATE_ASCENDING)
 
             episodes = episodes.order_by(*order_clauses)
 
-            self._load_by_chunks(iter(episodes), self.listbox.get_ids())
+            # The rows are added in the order of the query, and only sorted
+            # once at the end of the update, instead of at each insertion
+            self.listbox.set_sort_func(None)
+
+            # Stream the episodes from the cursor as the chunks are loaded,
+            # without keeping a cache of the results in the query. The rows
+            # are built from the fields of the episodes, and the Episode
+            # objects are only created when they are needed.
+            self._load_by_chunks(episodes.dicts().iterator(),
+                                 set(self.listbox.get_ids()))
 
     def update_episode(self, episode):
         """Update an episode
@@ -174,11 +242,8 @@ class EpisodeList(Gtk.VBox):
         ----------
         episode : Episode
         """
-        try:
-            row = self.listbox.get_row(episode.id)
-        except ValueError:
-            pass
-        else:
+        row = self.listbox.get_row_or_none(episode.id)
+        if row is not None:
             row.episode = episode
             row.update()
 
@@ -188,8 +253,8 @@ class EpisodeList(Gtk.VBox):
 
         Parameters
         ----------
-        episodes : Iterable[Episode]
-            The episodes which will be displayed
+        episodes : Iterable[dict]
+            The fields of the episodes which will be displayed
         remove_ids : Set
             Set of ids that were in the list but have not been updated yet
             (these should be removed of the list at the end)
@@ -197,35 +262,41 @@ class EpisodeList(Gtk.VBox):
         """
         for _ in range(0, CHUNK_SIZE):
             try:
-                episode = next(episodes)
+                data = next(episodes)
             except StopIteration:
                 # Remove the episodes that are not in the database anymore
                 for episode_id in remove_ids:
                     self.listbox.remove_id(episode_id)
 
+                self.listbox.set_sort_func(self.get_sort_func())
+
                 self.update_id = None
                 return
             else:
-                try:
-                    row = self.listbox.get_row(episode.id)
-                except ValueError:
+                episode_id = data["id"]
+                row = self.listbox.get_row_or_none(episode_id)
+                if row is None:
                     # The row does not exist, create it
-                    row = EpisodeRow(episode)
-                    row.connect("toggle", self._toggle)
-                    row.connect("download", self._download)
+                    row = EpisodeRow(data)
+                    row.toggle_button.connect(
+                        "clicked", self._on_toggle_clicked, row)
+                    row.download_button.connect(
+                        "clicked", self._on_download_clicked, row)
                     row.set_online(self.application.get_online())
 
-                    if episode == self.player.episode:
+                    player_episode = self.player.episode
+                    if (player_episode is not None and
+                            player_episode.id == episode_id):
                         # The episode is currently being played
                         row.set_progress(self.player.get_seconds_position(),
                                          self.player.get_seconds_duration())
                         row.set_player_state(self.player.state)
 
-                    self.listbox.add_with_id(row, episode.id)
+                    self.listbox.add_with_id(row, episode_id)
                 else:
                     # The row already exists, update it
-                    remove_ids.remove(episode.id)
-                    row.episode = episode
+                    remove_ids.remove(episode_id)
+                    row.episode = data
                     row.update()
 
         # Load the rest of the episodes in a future iteration of the main
@@ -233,9 +304,23 @@ class EpisodeList(Gtk.VBox):
         self.update_id = GLib.idle_add(self._load_by_chunks, episodes,
                                        remove_ids)
 
-    def sort_func(self, row1, row2):
+    def get_sort_func(self):
+        """Return the sort function corresponding to the state of the sort
+        button
+
+        Returns
+        -------
+        Callable[[EpisodeRow, EpisodeRow], int]
+            Either :meth:`sort_ascending` or :meth:`sort_descending`
+        """
+        if self.sort.get_descending():
+            return self.sort_descending
+        return self.sort_ascending
+
+    @staticmethod
+    def sort_ascending(row1, row2):
         """Compare two rows to determine which should be first. Sort them
-        by date
+        by ascending date
 
         Parameters
         ----------
@@ -251,17 +336,20 @@ class EpisodeList(Gtk.VBox):
             0 if they are equal,
             1 otherwise
         """
-        if self.sort.get_descending():
-            delta = 1
-        else:
-            delta = -1
+        pubdate1 = row1.pubdate
+        pubdate2 = row2.pubdate
+        return (pubdate1 > pubdate2) - (pubdate1 < pubdate2)
 
-        if row1.episode.pubdate < row2.episode.pubdate:
-            return delta
-        elif row1.episode.pubdate == row2.episode.pubdate:
-            return 0
-        else:
-            return -delta
+    @staticmethod
+    def sort_descending(row1, row2):
+        """Compare two rows to determine which should be first. Sort them
+        by descending date
+
+        See :meth:`sort_ascending`.
+        """
+        pubdate1 = row1.pubdate
+        pubdate2 = row2.pubdate
+        return (pubdate1 < pubdate2) - (pubdate1 > pubdate2)
 
     def filter_func(self, row):
         """Check if a row should be visible or not
@@ -276,9 +364,9 @@ class EpisodeList(Gtk.VBox):
         bool
             True if the row should be visible.
         """
-        for filter_button in self.filters:
+        for filter_button, flag in zip(self.filters, row.flags):
             state = filter_button.state
-            if state is not None and filter_button.key(row.episode) != state:
+            if state is not None and flag != state:
                 return False
 
         return True
@@ -290,9 +378,16 @@ class EpisodeList(Gtk.VBox):
         if selection == []:
             return
 
+        # Check which actions are possible in a single pass
+        actions = 0
+        for row in selection:
+            actions |= row.actions
+            if actions == ALL_ACTIONS:
+                break
+
         menu = Gtk.Menu()
 
-        if any(not row.episode.local_path for row in selection):
+        if actions & ACTION_DOWNLOAD:
             menu_item = Gtk.MenuItem("Download")
             menu_item.connect("activate", cb(self._download_selection),
                               selection)
@@ -303,19 +398,19 @@ class EpisodeList(Gtk.VBox):
                               selection)
             menu.append(menu_item)
 
-        if any(not row.episode.played for row in selection):
+        if actions & ACTION_MARK_AS_PLAYED:
             menu_item = Gtk.MenuItem("Mark as played")
             menu_item.connect("activate", cb(self._mark_as_played),
                               selection)
             menu.append(menu_item)
 
-        if any(row.episode.played for row in selection):
+        if actions & ACTION_MARK_AS_UNPLAYED:
             menu_item = Gtk.MenuItem("Mark as unplayed")
             menu_item.connect("activate", cb(self._mark_as_unplayed),
                               selection)
             menu.append(menu_item)
 
-        if any(row.episode.progress > 0 for row in selection):
+        if actions & ACTION_RESET_PROGRESS:
             menu_item = Gtk.MenuItem("Reset progress")
             menu_item.connect("activate", cb(self._reset_progress),
                               selection)
@@ -332,19 +427,16 @@ class EpisodeList(Gtk.VBox):
         rows : List[EpisodeRow]
             The selected rows
         """
-        with database.transaction():
-            for row in rows:
-                row.episode.mark_as_played()
-                row.update()
-                row.episode.save()
-
-                action = EpisodeAction(episode=row.episode, action="play",
-                                       started=row.episode.duration,
-                                       position=row.episode.duration,
-                                       total=row.episode.duration)
-                action.save()
+        for row in rows:
+            row.episode.mark_as_played()
 
-        self.emit("episodes-changed")
+        self._save_rows(rows, {"played": True, "new": False}, [
+            {"episode": row.episode, "action": "play",
+             "started": row.episode.duration,
+             "position": row.episode.duration,
+             "total": row.episode.duration}
+            for row in rows
+        ])
 
     def _mark_as_unplayed(self, rows):
         """Mark selected rows as unplayed
@@ -354,16 +446,13 @@ class EpisodeList(Gtk.VBox):
         rows : List[EpisodeRow]
             The selected rows
         """
-        with database.transaction():
-            for row in rows:
-                row.episode.mark_as_unplayed()
-                row.update()
-                row.episode.save()
+        for row in rows:
+            row.episode.mark_as_unplayed()
 
-                action = EpisodeAction(episode=row.episode, action="new")
-                action.save()
-
-        self.emit("episodes-changed")
+        self._save_rows(rows, {"played": False}, [
+            {"episode": row.episode, "action": "new"}
+            for row in rows
+        ])
 
     def _reset_progress(self, rows):
         """Reset the progresses of the selected rows
@@ -373,16 +462,56 @@ class EpisodeList(Gtk.VBox):
         rows : List[EpisodeRow]
             The selected rows
         """
-        with database.transaction():
-            for row in rows:
-                row.episode.progress = 0
-                row.update()
-                row.episode.save()
+        for row in rows:
+            row.episode.progress = 0
 
-                action = EpisodeAction(episode=row.episode, action="play",
-                                       started=0, position=0,
-                                       total=row.episode.duration)
-                action.save()
+        self._save_rows(rows, {"progress": 0}, [
+            {"episode": row.episode, "action": "play",
+             "started": 0, "position": 0,
+             "total": row.episode.duration}
+            for row in rows
+        ])
+
+    def _save_rows(self, rows, values, actions):
+        """Save the modifications of the episodes of several rows with bulk
+        queries in a separate thread, and update the rows once they are saved
+
+        Parameters
+        ----------
+        rows : List[EpisodeRow]
+            The modified rows
+        values : dict
+            The new values of the fields of the episodes, which are the same
+            for all of them
+        actions : List[dict]
+            The episode actions that should be saved
+        """
+        episode_ids = [row.episode.id for row in rows]
+
+        def _save():
+            with database.transaction():
+                for batch in chunked(episode_ids, SAVE_BATCH_SIZE):
+                    (Episode
+                     .update(**values)
+                     .where(Episode.id << batch)
+                     .execute())
+
+                for batch in chunked(actions, SAVE_BATCH_SIZE):
+                    EpisodeAction.insert_many(batch).execute()
+
+        future = _DATABASE_EXECUTOR.submit(_save)
+        future.add_done_callback(
+            lambda future: idle_call(self._on_rows_saved, rows, future))
+
+    def _on_rows_saved(self, rows, future):
+        """Called in the main thread once the episodes of rows are saved"""
+        try:
+            future.result()
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception("Unable to save the episodes.")
+
+        for row in rows:
+            row.update()
 
         self.emit("episodes-changed")
 
@@ -448,28 +577,66 @@ class EpisodeList(Gtk.VBox):
     def set_player_progress(self, position, duration):
         """Called when the progress of the playback changes. Updates the
         row of the episode being played"""
-        try:
-            row = self.listbox.get_row(self.player.episode.id)
-        except ValueError:
-            pass
-        else:
+        row = self.listbox.get_row_or_none(self.player.episode.id)
+        if row is not None:
             row.set_progress(position // Gst.SECOND, duration // Gst.SECOND)
 
     def set_player_state(self, episode, state):
         """Called when the state of the player changes. Updates the
         row of the episode being played"""
-        try:
-            row = self.listbox.get_row(episode.id)
-        except ValueError:
-            pass
-        else:
+        row = self.listbox.get_row_or_none(episode.id)
+        if row is not None:
             row.set_player_state(state)
 
     def set_network_state(self, online, _):
         """Called when the network state changes"""
+        # The signal is also emitted when only the error state changes
+        if online == self.online:
+            return
+        self.online = online
+
         for row in self.listbox.rows.values():
             row.set_online(online)
 
+    def get_adjacent_episodes(self, episode):
+        """Return the visible episodes displayed just before and after an
+        episode.
+
+        Parameters
+        ----------
+        episode : :class:`Episode`
+            The episode.
+
+        Returns
+        -------
+        list of :class:`Episode`
+        """
+        row = self.listbox.get_row_or_none(episode.id)
+        if row is None:
+            return []
+
+        index = row.get_index()
+        episodes = []
+        for delta in (-1, 1):
+            row = self.listbox.get_row_at_index(index + delta)
+            while row is not None and not is_visible(row):
+                row = self.listbox.get_row_at_index(row.get_index() + delta)
+
+            if row is not None:
+                episodes.append(row.episode)
+
+        return episodes
+
+    def _on_sort_clicked(self, button):
+        """Called when the sort button is clicked"""
+        if self.update_id is not None:
+            # The rows are being loaded unsorted, the sort function will be
+            # set at the end of the loading
+            return
+
+        # Setting the sort function invalidates the sort
+        self.listbox.set_sort_func(self.get_sort_func())
+
     def _on_selected_rows_changed(self, listbox):
         rows = self.listbox.get_selected_rows()
         if len(rows) == 1:
@@ -482,24 +649,36 @@ class EpisodeRow(Gtk.ListBoxRow):
     # pylint: disable=too-many-instance-attributes
     """Row in the list of episodes
 
-    Signals
-    -------
-    toggle
-        Emitted when the toggle button is clicked
-    download
-        Emitted when the download button is clicked
+    The ``clicked`` signals of the toggle and download buttons are handled
+    directly by the :class:`EpisodeList`.
     """
 
-    __gsignals__ = {
-        'toggle': (GObject.SIGNAL_RUN_FIRST, None, ()),
-        'download': (GObject.SIGNAL_RUN_FIRST, None, ()),
-    }
-
     def __init__(self, episode):
         Gtk.ListBoxRow.__init__(self)
 
+        # The row can be built either from an Episode, or from a dictionnary
+        # of its fields (see the episode property)
+        self._episode = None
+        self._data = None
         self.episode = episode
 
+        # Values used to sort and filter the rows, which are updated by
+        # update() so that the sort and filter functions do not need to
+        # access the episode's fields
+        self.pubdate = None
+        self.flags = None
+
+        # Flags of the actions of the context menu possible for the episode
+        self.actions = 0
+
+        # Values of the fields of the episode that were displayed by the last
+        # call to update()
+        self.signature = None
+
+        # Sensitivity of the download and toggle buttons set by the last call
+        # to set_online()
+        self.sensitivity = None
+
         grid = Gtk.Grid()
         grid.set_column_spacing(5)
         self.add(grid)
@@ -528,17 +707,24 @@ class EpisodeRow(Gtk.ListBoxRow):
         topgrid.attach(self.date, 0, 1, 1, 1)
 
         # Download button
-        self.download_button = Gtk.Button.new_from_icon_name(
-            "document-save-symbolic", Gtk.IconSize.BUTTON)
+        self.download_button = Gtk.Button()
+        self.download_button.set_image(
+            Gtk.Image.new_from_gicon(ICON_DOWNLOAD, Gtk.IconSize.BUTTON))
         self.download_button.set_tooltip_text("Download the episode")
         self.download_button.set_relief(Gtk.ReliefStyle.NONE)
-        self.download_button.connect('clicked', cb(self.emit), "download")
         topgrid.attach(self.download_button, 1, 0, 1, 2)
 
-        # Play button
+        # Play button (the images are created once, and swapped when the state
+        # of the player changes)
+        self.play_image = Gtk.Image.new_from_gicon(ICON_PLAY,
+                                                   Gtk.IconSize.BUTTON)
+        self.pause_image = Gtk.Image.new_from_gicon(ICON_PAUSE,
+                                                    Gtk.IconSize.BUTTON)
+        self.play_image.show()
+        self.pause_image.show()
+
         self.toggle_button = Gtk.Button()
         self.toggle_button.set_relief(Gtk.ReliefStyle.NONE)
-        self.toggle_button.connect('clicked', cb(self.emit), "toggle")
         topgrid.attach(self.toggle_button, 2, 0, 1, 2)
 
         # Episode subtitle
@@ -568,39 +754,91 @@ class EpisodeRow(Gtk.ListBoxRow):
 
         self.update()
 
+    @property
+    def episode(self):
+        """Episode: the episode displayed by the row.
+
+        If the row was built from the fields of the episode, the Episode
+        object is created the first time it is accessed."""
+        if self._episode is None:
+            self._episode = Episode(**self._data)
+            self._data = None
+        return self._episode
+
+    @episode.setter
+    def episode(self, episode):
+        if isinstance(episode, dict):
+            self._episode = None
+            self._data = episode
+        else:
+            self._episode = episode
+            self._data = None
+
+    def _get_field(self, name):
+        """Return the value of a field of the episode, without creating the
+        Episode object"""
+        if self._episode is None:
+            return self._data[name]
+        return getattr(self._episode, name)
+
     def update(self):
-        """Update the widget"""
+        """Update the widget, unless the displayed fields of the episode did
+        not change since the last update"""
+        get_field = self._get_field
+        new = get_field("new")
+        played = get_field("played")
+        local_path = get_field("local_path")
+        progress = get_field("progress")
+        duration = get_field("duration")
+        title = get_field("title")
+        subtitle = get_field("subtitle")
+        pubdate = get_field("pubdate")
+
+        signature = (new, played, local_path, progress, duration, title,
+                     subtitle, pubdate)
+        if signature == self.signature:
+            return
+        self.signature = signature
+
+        new_changed = self.flags is None or self.flags[0] != new
+
+        self.pubdate = pubdate
+        self.flags = (new, played, local_path is not None)
+        self.actions = (
+            (ACTION_DOWNLOAD if not local_path else 0) |
+            (ACTION_MARK_AS_UNPLAYED if played else ACTION_MARK_AS_PLAYED) |
+            (ACTION_RESET_PROGRESS if progress > 0 else 0)
+        )
+
         # Episode status
-        if self.episode.new:
-            self.icon.set_from_icon_name("erika-episode-new",
-                                         Gtk.IconSize.BUTTON)
-            self.icon.set_tooltip_text("New episode")
-        else:
-            self.icon.set_from_icon_name("erika-episode-old",
-                                         Gtk.IconSize.BUTTON)
-            self.icon.set_tooltip_text("Old episode")
+        if new_changed:
+            if new:
+                self.icon.set_from_gicon(ICON_NEW, Gtk.IconSize.BUTTON)
+                self.icon.set_tooltip_text("New episode")
+            else:
+                self.icon.set_from_gicon(ICON_OLD, Gtk.IconSize.BUTTON)
+                self.icon.set_tooltip_text("Old episode")
 
         # Episode title
-        self.title.set_sensitive(not self.episode.played)
-        self.title.set_markup("<b>{}</b>".format(
-            GLib.markup_escape_text(self.episode.title)))
+        self.title.set_sensitive(not played)
+        self.title.set_markup("<b>{}</b>".format(escape_markup(title)))
 
         # Publication date
-        self.date.set_sensitive(not self.episode.played)
-        self.date.set_text("{:%d/%m/%Y}".format(self.episode.pubdate))
+        self.date.set_sensitive(not played)
+        self.date.set_text(pubdate.strftime("%d/%m/%Y"))
 
         # Episode subtitle
-        self.subtitle.set_sensitive(not self.episode.played)
-        self.subtitle.set_text(self.episode.subtitle)
+        self.subtitle.set_sensitive(not played)
+        self.subtitle.set_text(subtitle)
 
         # Episode duration
-        self.duration.set_sensitive(not self.episode.played)
+        self.duration.set_sensitive(not played)
 
-        self.set_progress(self.episode.progress, self.episode.duration)
+        self.set_progress(progress, duration)
         self.set_player_state(Player.STOPPED)
 
         # Download button
-        self.download_button.set_visible(not self.episode.local_path)
+        self.download_button.set_visible(not local_path)
 
     def set_progress(self, position, duration):
         """Set the progress of the playback of the episode"""
@@ -621,17 +859,23 @@ class EpisodeRow(Gtk.ListBoxRow):
     def set_player_state(self, state):
         """Set the state of the player for this episode"""
         if state == Player.PLAYING or state == Player.BUFFERING:
-            self.toggle_button.set_image(
-                Gtk.Image.new_from_icon_name("media-playback-pause-symbolic",
-                                             Gtk.IconSize.BUTTON))
-            self.toggle_button.set_tooltip_text("Pause the episode")
+            image = self.pause_image
+            tooltip = "Pause the episode"
         else:
-            self.toggle_button.set_image(
-                Gtk.Image.new_from_icon_name("media-playback-start-symbolic",
-                                             Gtk.IconSize.BUTTON))
-            self.toggle_button.set_tooltip_text("Play the episode")
+            image = self.play_image
+            tooltip = "Play the episode"
+
+        if self.toggle_button.get_image() is not image:
+            self.toggle_button.set_image(image)
+            self.toggle_button.set_tooltip_text(tooltip)
 
     def set_online(self, online):
         """Called when the network state changes"""
-        self.download_button.set_sensitive(online)
-        self.toggle_button.set_sensitive(online or self.episode.downloaded)
+        sensitivity = (online,
+                       online or self._get_field("local_path") is not None)
+        if sensitivity == self.sensitivity:
+            return
+        self.sensitivity = sensitivity
+
+        self.download_button.set_sensitive(sensitivity[0])
+        self.toggle_button.set_sensitive(sensitivity[1])
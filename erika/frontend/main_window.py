@@ -69,6 +69,7 @@ class MainWindow(Gtk.ApplicationWindow):
 
         self.player.connect("episode-updated", self._on_episode_updated)
         self.player.connect('progress-changed', cb(player_title.set_progress))
+        self.player.connect('buffered-changed', cb(player_title.set_buffered))
         self.player.connect('state-changed',
                             cb(player_controls.set_player_state, 2))
         self.player.connect('state-changed',
@@ -101,7 +102,7 @@ class MainWindow(Gtk.ApplicationWindow):
         self.episode_list.connect('download',
                                   cb(self.downloads_button.download))
         self.episode_list.connect('episode-selected',
-                                  cb(self.details.show_episode))
+                                  self._on_episode_selected)
         self.episode_list.connect('podcast-selected',
                                   cb(self.details.show_podcast))
 
@@ -176,7 +177,6 @@ class MainWindow(Gtk.ApplicationWindow):
         Called when the window is closed.
         """
         self.player.stop()
-        self.downloads_button.stop()
 
     def _on_episodes_changed(self, episodes_list):
         """
@@ -188,6 +188,16 @@ class MainWindow(Gtk.ApplicationWindow):
         self.podcast_list.update_current()
         self.update_counts()
 
+    def _on_episode_selected(self, episode_list, episode):
+        """
+        Called when an episode is selected in the episodes list.
+
+        Show its details, and prefetch the images of the adjacent episodes.
+        """
+        self.details.show_episode(episode)
+        self.details.prefetch_images(
+            episode_list.get_adjacent_episodes(episode))
+
     def _on_episode_updated(self, widget, episode):
         """
         Called when an episode is updated by a widget
@@ -38,6 +38,25 @@ from erika.library.models import Config, EpisodeAction
 # For some reason this is not defined in the python gstreamer bindings.
 GST_PLAY_FLAG_DOWNLOAD = 1 << 7
 
+# Minimal saved progress (in seconds) for which the playback is resumed
+# where it was stopped, instead of from the start
+MIN_RESUME_SECONDS = 2
+
+# Types of the bus messages handled by the player
+HANDLED_MESSAGES = ("eos", "error", "duration-changed", "async-done",
+                    "state-changed")
+
+# Constants used by the progress timer
+FORMAT_TIME = Gst.Format.TIME
+SECOND = Gst.SECOND
+
+# Interval between two checks of the playback progress (in milliseconds)
+PROGRESS_INTERVAL = 200
+
+# Interval between two checks of the buffered position while the playback is
+# paused or buffering (in milliseconds)
+BUFFERED_INTERVAL = 1000
+
 
 class Player(GObject.Object):
     """
@@ -48,7 +67,11 @@ class Player(GObject.Object):
     episode-updated(Episode)
         Emitted at the end of the playback of an episode.
     progress-changed(position, duration)
-        Emitted every 200ms during playback.
+        Emitted during playback, when the position (in seconds) or the
+        duration changes.
+    buffered-changed(buffered)
+        Emitted while the playback is paused or buffering, when the position
+        up to which the episode has been buffered changes.
     state-changed(episode, state)
         Emitted when the player state has changed.
     """
@@ -64,6 +87,8 @@ class Player(GObject.Object):
         'progress-changed':
             (GObject.SIGNAL_RUN_FIRST, None, (GObject.TYPE_INT64,
                                               GObject.TYPE_INT64)),
+        'buffered-changed':
+            (GObject.SIGNAL_RUN_FIRST, None, (GObject.TYPE_INT64,)),
         'state-changed':
             (GObject.SIGNAL_RUN_FIRST, None, (GObject.TYPE_PYOBJECT,
                                               GObject.TYPE_INT,)),
@@ -77,10 +102,14 @@ class Player(GObject.Object):
 
         self.episode = None
         self.state = Player.STOPPED
+        self._state_episode = None
         self._started = 0
         self._duration = 0
 
         self.progress_timer = None
+        self._last_progress = None
+        self.buffered_timer = None
+        self._last_buffered = None
 
         # Create player
         self.player = Gst.ElementFactory.make("playbin")
@@ -88,9 +117,17 @@ class Player(GObject.Object):
         flags |= GST_PLAY_FLAG_DOWNLOAD
         self.player.set_property("flags", flags)
 
+        # Bound method used by the progress timer
+        self._query_position = self.player.query_position
+
+        # Only the handled types of messages are passed to _on_message (the
+        # other ones are filtered by the signal details, without calling
+        # Python code)
         bus = self.player.get_bus()
         bus.add_signal_watch()
-        bus.connect("message", self._on_message)
+        for message_type in HANDLED_MESSAGES:
+            bus.connect("message::{}".format(message_type),
+                        self._on_message)
 
     def play_episode(self, episode):
         """Start the playback of an episode
@@ -110,16 +147,19 @@ class Player(GObject.Object):
         else:
             uri = episode.file_url
 
+            # Buffer a fixed duration of the stream, instead of letting
+            # playbin guess it
+            buffer_seconds = Config.get_cached_value("player.buffer_seconds")
+            self.player.set_property("buffer-duration",
+                                     buffer_seconds * Gst.SECOND)
+
         self.player.set_property("uri", uri)
         self.player.set_state(Gst.State.PLAYING)
 
-        self.progress_timer = GObject.timeout_add(200, self._emit_progress)
-
     def stop(self):
         """Stop the playback of an episode"""
-        if self.progress_timer:
-            GLib.source_remove(self.progress_timer)
-            self.progress_timer = None
+        self._stop_progress_timer()
+        self._stop_buffered_timer()
 
         if not self.episode:
             return
@@ -178,32 +218,41 @@ class Player(GObject.Object):
         unknown"""
         return self.get_position() // Gst.SECOND
 
-    def percent_to_time(self, percent):
-        """Convert a time in format Gst.Format.PERCENT to Gst.Format.TIME
+    def get_buffered(self, position=None):
+        """Return the position up to which the episode has been buffered
 
         Parameters
         ----------
-        percent : int
+        position : int, optional
+            The current playback position, in nanoseconds (queried if it is
+            not given)
         """
-        duration = self.get_duration()
-        return percent * duration / 1000000
+        if position is None:
+            position = self.get_position()
 
-    def get_buffered(self):
-        """Return the percentage of the episode that has been buffered"""
-        position = self.player.query_position(Gst.Format.PERCENT)[1] or 0
+        # The conversions between percents and times are done inline, with
+        # the duration fetched once
+        duration = self.get_duration()
+        if not duration:
+            # The buffered range cannot be converted to a time
+            return position
+        percent = position * 1000000 // duration
 
+        # The query is not reused, since the elements answering it append
+        # their ranges to it
         query = Gst.Query.new_buffering(Gst.Format.PERCENT)
         if self.player.query(query):
             stop = query.parse_buffering_range()[2]
-            if stop >= position:
-                return self.percent_to_time(stop)
+            if stop < percent:
+                for range_index in range(0, query.get_n_buffering_ranges()):
+                    stop = query.parse_nth_buffering_range(range_index)[2]
+                    if stop >= percent:
+                        break
 
-            for range_index in range(0, query.get_n_buffering_ranges()):
-                stop = query.parse_nth_buffering_range(range_index)[2]
-                if stop >= position:
-                    return self.percent_to_time(stop)
+            if stop >= percent:
+                return stop * duration // 1000000
 
-        return self.get_position()
+        return position
 
     def seek(self, position):
         """Send a seek event to the player
@@ -250,6 +299,11 @@ class Player(GObject.Object):
             success, duration = self.player.query_duration(Gst.Format.TIME)
             if success:
                 self._duration = duration
+        elif message.type == Gst.MessageType.ASYNC_DONE:
+            # A seek has been completed (the progress is not checked
+            # periodically when the playback is paused)
+            if self.episode:
+                self._emit_progress()
         elif message.type == Gst.MessageType.STATE_CHANGED:
             oldstate, newstate, _ = message.parse_state_changed()
             if oldstate == newstate:
@@ -260,8 +314,11 @@ class Player(GObject.Object):
 
             if all((oldstate == Gst.State.READY,
                     newstate == Gst.State.PAUSED,
-                    self.episode.progress > 0)):
-                self.seek(self.episode.progress * Gst.SECOND)
+                    self.episode.progress >= MIN_RESUME_SECONDS)):
+                position = self.episode.progress * Gst.SECOND
+                duration = self.get_duration()
+                if not duration or position < duration:
+                    self.seek(position)
 
             if newstate == Gst.State.READY:
                 self.set_state(Player.BUFFERING)
@@ -270,18 +327,88 @@ class Player(GObject.Object):
             elif newstate == Gst.State.PAUSED:
                 self.set_state(Player.PAUSED)
 
+    def _start_progress_timer(self):
+        """Start checking the playback progress periodically"""
+        if self.progress_timer is None:
+            self._last_progress = None
+
+            # The timer has the priority of idle callbacks, so that the
+            # progress updates are delayed (and skipped, since a GLib timer
+            # does not accumulate missed ticks) when the main loop is busy
+            # with events or redraws
+            self.progress_timer = GLib.timeout_add(
+                PROGRESS_INTERVAL, self._emit_progress,
+                priority=GLib.PRIORITY_DEFAULT_IDLE)
+
+    def _stop_progress_timer(self):
+        """Stop checking the playback progress"""
+        if self.progress_timer is not None:
+            GLib.source_remove(self.progress_timer)
+            self.progress_timer = None
+
+    def _start_buffered_timer(self):
+        """Start checking the buffered position periodically"""
+        if self.buffered_timer is None:
+            self._last_buffered = None
+            self.buffered_timer = GLib.timeout_add(
+                BUFFERED_INTERVAL, self._emit_buffered,
+                priority=GLib.PRIORITY_DEFAULT_IDLE)
+
+    def _stop_buffered_timer(self):
+        """Stop checking the buffered position"""
+        if self.buffered_timer is not None:
+            GLib.source_remove(self.buffered_timer)
+            self.buffered_timer = None
+
+    def _emit_buffered(self):
+        """Emit a buffered-changed signal if the buffered position changed.
+        Called every BUFFERED_INTERVAL ms while the playback is paused or
+        buffering"""
+        buffered = self.get_buffered()
+        if buffered != self._last_buffered:
+            self._last_buffered = buffered
+            self.emit('buffered-changed', buffered)
+
+        return True
+
     def _emit_progress(self):
-        """Emit a progress-changed signal. Called every 200ms during
-        playback"""
-        position = self.get_position()
-        duration = self.get_duration()
-        self.emit('progress-changed', position, duration)
+        """Emit a progress-changed signal if the position (in seconds) or the
+        duration changed. Called every PROGRESS_INTERVAL ms during playback"""
+        # Same as get_position and get_duration, without the method calls
+        # (the duration is usually already known)
+        success, position = self._query_position(FORMAT_TIME)
+        if not success:
+            position = 0
+        duration = self._duration or self.get_duration()
+
+        progress = (position // SECOND, duration)
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self.emit('progress-changed', position, duration)
 
         return True
 
     def set_state(self, state):
         """Set the current state of the player"""
+        if state == self.state and self.episode is self._state_episode:
+            # Nothing changed (the pipeline often goes through the same state
+            # several times)
+            return
         self.state = state
+        self._state_episode = self.episode
+
+        # The progress only changes during the playback, but the episode is
+        # still being downloaded while the playback is paused or buffering
+        if state == Player.PLAYING:
+            self._stop_buffered_timer()
+            self._start_progress_timer()
+        else:
+            self._stop_progress_timer()
+            if state == Player.STOPPED:
+                self._stop_buffered_timer()
+            else:
+                self._start_buffered_timer()
+
         self.emit('state-changed', self.episode, state)
 
     def play(self):
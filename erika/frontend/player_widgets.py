@@ -29,12 +29,11 @@ Audio player widgets
 from gi.repository import GObject
 from gi.repository import Gst
 from gi.repository import Gtk
-from gi.repository import GLib
 
 from erika.__version__ import __appname__
 from erika.util import format_duration
 from .player import Player
-from .util import cb, get_builder
+from .util import cb, escape_markup, get_builder
 
 
 class PlayerTitle(Gtk.Stack):
@@ -61,6 +60,14 @@ class PlayerTitle(Gtk.Stack):
             builder.get_object("playing_1"),
             builder.get_object("playing_2")
         ]
+        # Markup displayed by the playing labels
+        self.playing_markup = None
+
+        # Values displayed by the last call to set_progress
+        self.last_duration = None
+        self.last_buffered = None
+        self.last_seconds = None
+
         self.progress = builder.get_object("progress")
         self.position = builder.get_object("position")
         self.duration = builder.get_object("duration")
@@ -80,11 +87,13 @@ class PlayerTitle(Gtk.Stack):
             Player.PAUSED, or Player.PLAYING)
         """
         if episode:
-            for playing in self.playing:
-                playing.set_markup(
-                    "<b>{}</b> from <b><i>{}</i></b>".format(
-                        GLib.markup_escape_text(episode.title),
-                        GLib.markup_escape_text(episode.podcast.title)))
+            markup = "<b>{}</b> from <b><i>{}</i></b>".format(
+                escape_markup(episode.title),
+                escape_markup(episode.podcast.title))
+            if markup != self.playing_markup:
+                self.playing_markup = markup
+                for playing in self.playing:
+                    playing.set_markup(markup)
 
         if state in [Player.PLAYING, Player.PAUSED]:
             self._update_progress()
@@ -98,13 +107,27 @@ class PlayerTitle(Gtk.Stack):
 
     def set_progress(self, position, duration):
         """Called when the progress of the playback changes"""
-        self.progress.set_range(0, duration)
+        if duration != self.last_duration:
+            self.last_duration = duration
+            self.progress.set_range(0, duration)
+            self.duration.set_text(format_duration(duration // Gst.SECOND))
+
         if not self.seeking:
             self.progress.set_value(position)
-        self.progress.set_fill_level(self.player.get_buffered())
 
-        self.position.set_text(format_duration(position // Gst.SECOND))
-        self.duration.set_text(format_duration(duration // Gst.SECOND))
+        self.set_buffered(self.player.get_buffered(position))
+
+        seconds = position // Gst.SECOND
+        if seconds != self.last_seconds:
+            self.last_seconds = seconds
+            self.position.set_text(format_duration(seconds))
+
+    def set_buffered(self, buffered):
+        """Called when the position up to which the episode has been buffered
+        changes"""
+        if buffered != self.last_buffered:
+            self.last_buffered = buffered
+            self.progress.set_fill_level(buffered)
 
     def _on_seeking_start(self, scale, event):
         """
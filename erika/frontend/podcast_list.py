@@ -34,7 +34,7 @@ from gi.repository import GLib
 from gi.repository import Gio
 
 from erika.library.models import Podcast
-from .util import cb
+from .util import cb, escape_markup
 from .widgets import Label, IndexedListBox
 
 IMAGE_SIZE = 64
@@ -43,7 +43,8 @@ SUBTITLE_LINES = 2
 
 def sort_func(row1, row2):
     """Compare two rows to determine which should be first. Sort them
-    alphabetically by podcast title.
+    alphabetically by podcast title (using the sort keys precomputed by the
+    rows).
 
     Parameters
     ----------
@@ -59,12 +60,9 @@ def sort_func(row1, row2):
         0 if they are equal,
         1 otherwise
     """
-    if row1.podcast.title is None:
-        return 1
-    elif row2.podcast.title is None:
-        return -1
-    else:
-        return locale.strcoll(row1.podcast.title, row2.podcast.title)
+    key1 = row1.sort_key
+    key2 = row2.sort_key
+    return (key1 > key2) - (key1 < key2)
 
 
 class PodcastList(Gtk.VBox):
@@ -132,30 +130,39 @@ class PodcastList(Gtk.VBox):
     def update(self):
         """Update the list of podcasts"""
         # Set of ids that should be removed
-        remove_ids = self.list.get_ids()
+        remove_ids = set(self.list.get_ids())
 
-        for podcast in Podcast.select():
-            try:
-                row = self.list.get_row(podcast.id)
-            except ValueError:
+        # New rows, which are added at the end of the update
+        new_rows = []
+
+        for podcast, counts in Podcast.select_with_counts():
+            row = self.list.get_row_or_none(podcast.id)
+            if row is None:
                 # The row does not exist, create it
-                row = PodcastRow(podcast)
-                self.list.add_with_id(row, podcast.id)
+                new_rows.append((PodcastRow(podcast, counts), podcast.id))
             else:
                 # The row already exists, update it
                 remove_ids.remove(podcast.id)
                 row.podcast = podcast
-                row.update()
+                row.update(counts)
 
         # Remove the podcasts that are not in the database anymore
         for podcast_id in remove_ids:
             self.list.remove_id(podcast_id)
 
+        # The existing rows whose title changed are moved by PodcastRow.update
+        if new_rows:
+            # Add the new rows without sorting the list at each insertion,
+            # and sort it once (setting the sort function invalidates the
+            # sort)
+            self.list.set_sort_func(None)
+            for row, podcast_id in new_rows:
+                self.list.add_with_id(row, podcast_id)
+            self.list.set_sort_func(sort_func)
+
         if self.list.get_selected_row() is None:
             self.list.select_row(self.list.get_row_at_index(0))
 
-        self.list.invalidate_sort()
-
     def update_podcast(self, podcast):
         """Update a podcast
 
@@ -174,6 +181,16 @@ class PodcastList(Gtk.VBox):
             row.podcast = podcast
             row.update()
 
+    def update_podcasts(self, podcasts):
+        """Update several podcasts
+
+        Parameters
+        ----------
+        podcasts : List[Podcast]
+        """
+        for podcast in podcasts:
+            self.update_podcast(podcast)
+
     def update_current(self):
         """Update the selected row"""
         row = self.list.get_selected_row()
@@ -225,11 +242,19 @@ class PodcastList(Gtk.VBox):
 
 class PodcastRow(Gtk.ListBoxRow):
     """Row in the list of podcasts"""
-    def __init__(self, podcast):
+    def __init__(self, podcast, counts=None):
         Gtk.ListBoxRow.__init__(self)
 
         self.podcast = podcast
 
+        # Values of the fields of the podcast that were displayed by the last
+        # call to update()
+        self.signature = None
+
+        # Key used to sort the rows, and the title it was computed from
+        self.sort_key = None
+        self.sort_title = None
+
         self.grid = Gtk.Grid()
         self.grid.set_column_spacing(5)
         self.add(self.grid)
@@ -246,44 +271,86 @@ class PodcastRow(Gtk.ListBoxRow):
         # Unplayed and new counts
         self.counts = Label()
         self.counts.set_alignment(xalign=1, yalign=0.5)
-        self.grid.attach(self.counts, 2, 0, 2, 1)
+        self.grid.attach(self.counts, 2, 0, 1, 1)
 
         # Podcast subtitle
         self.subtitle = Label(lines=SUBTITLE_LINES)
         self.grid.attach(self.subtitle, 1, 1, 3, 1)
 
-        self.error_icon = Gtk.Image.new_from_icon_name(
-            'gtk-dialog-error', Gtk.IconSize.BUTTON)
-        self.error_icon.set_tooltip_text(
-            'The last update of this podcast failed.')
+        # Error icon, next to the counts (only created if the update of the
+        # podcast fails, which is rare, and then shown or hidden)
+        self.error_icon = None
 
-        self.update()
+        self.show_all()
+        self.update(counts)
+
+    def update(self, counts=None):
+        """Update the widget, unless the displayed fields of the podcast did
+        not change since the last update
+
+        Parameters
+        ----------
+        counts : Tuple[int, int, int], optional
+            The counts of episodes of the podcast, if they are already known
+            (see :meth:`Podcast.get_counts`).
+        """
+        if self.sort_key is None or self.podcast.title != self.sort_title:
+            sort_key_changed = self.sort_key is not None
+
+            self.sort_title = self.podcast.title
+            if self.sort_title is None:
+                # The podcasts without title are put at the end
+                self.sort_key = (True, "")
+            else:
+                self.sort_key = (False, locale.strxfrm(self.sort_title))
+
+            # Move the row to its new position in the listbox (whichever
+            # method replaced the podcast)
+            if sort_key_changed:
+                self.changed()
+
+        title = self.podcast.display_title
+        subtitle = self.podcast.display_subtitle
+        if counts is None:
+            counts = self.podcast.get_counts()
+        episodes_count, unplayed_count, new_count = counts
+
+        update_failed = self.podcast.update_failed
+        image_data = self.podcast.image.data
+
+        signature = (title, subtitle, episodes_count, unplayed_count,
+                     new_count, update_failed, image_data)
+        previous_signature = self.signature
+        if signature == previous_signature:
+            return
+        self.signature = signature
+
+        escaped_title = escape_markup(title)
 
-    def update(self):
-        """Update the widget"""
         self.grid.set_tooltip_markup((
             "<b>{title}</b>\n"
             "{episodes} episodes"
         ).format(
-            title=GLib.markup_escape_text(self.podcast.display_title),
-            episodes=self.podcast.episodes_count
+            title=escaped_title,
+            episodes=episodes_count
         ))
 
-        # Podcast Image
-        self.icon.set_from_pixbuf(self.podcast.image.as_pixbuf(IMAGE_SIZE))
+        # Podcast Image (only decoded when it changed)
+        if previous_signature is None or previous_signature[6] != image_data:
+            self.icon.set_from_pixbuf(
+                self.podcast.image.as_pixbuf(IMAGE_SIZE))
 
         # Podcast title
-        self.title.set_markup("<b>{}</b>".format(
-            GLib.markup_escape_text(self.podcast.display_title)))
+        self.title.set_markup("<b>{}</b>".format(escaped_title))
 
         # Unplayed and new counts
-        if self.podcast.unplayed_count > 0:
-            unplayed = str(self.podcast.unplayed_count)
+        if unplayed_count > 0:
+            unplayed = str(unplayed_count)
         else:
             unplayed = ""
 
-        if self.podcast.new_count > 0:
-            new = "<b>({})</b>".format(self.podcast.new_count)
+        if new_count > 0:
+            new = "<b>({})</b>".format(new_count)
         else:
             new = ""
 
@@ -292,17 +359,17 @@ class PodcastRow(Gtk.ListBoxRow):
         else:
             self.counts.set_markup(unplayed + " " + new)
 
-        # Update layout if there was an error
-        self.grid.remove(self.counts)
-        self.grid.remove(self.error_icon)
-        if self.podcast.update_failed:
-            self.grid.attach(self.counts, 2, 0, 1, 1)
+        # Show the error icon if the update failed (the column of the icon
+        # collapses when it is hidden)
+        if update_failed and self.error_icon is None:
+            self.error_icon = Gtk.Image.new_from_icon_name(
+                'gtk-dialog-error', Gtk.IconSize.BUTTON)
+            self.error_icon.set_tooltip_text(
+                'The last update of this podcast failed.')
             self.grid.attach(self.error_icon, 3, 0, 1, 1)
-        else:
-            self.grid.attach(self.counts, 2, 0, 2, 1)
+        if self.error_icon is not None:
+            self.error_icon.set_visible(bool(update_failed))
 
         # Podcast subtitle (only the first line)
-        self.subtitle.set_text(
-            self.podcast.display_subtitle.split('\n')[0])
-
-        self.show_all()
+        if previous_signature is None or previous_signature[1] != subtitle:
+            self.subtitle.set_text(subtitle.partition('\n')[0])
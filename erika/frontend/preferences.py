@@ -40,9 +40,10 @@ class PreferencesDialog(Gtk.Dialog):
                'gpodder.devicename', 'gpodder.password', 'gpodder.username',
                'gpodder.hostname']
     SPINS = ['library.synchronize_interval', 'downloads.workers',
-             'player.smart_mark_seconds']
+             'player.smart_mark_seconds', 'player.buffer_seconds']
     CHECKS = ['gpodder.synchronize']
     FILES = ['library.root']
+    KEYS = ENTRIES + SPINS + CHECKS + FILES
 
     def __init__(self, parent=None):
         Gtk.Dialog.__init__(self, "Preferences", parent, 0,
@@ -50,46 +51,50 @@ class PreferencesDialog(Gtk.Dialog):
                              Gtk.STOCK_APPLY, Gtk.ResponseType.OK))
 
         # Initialize dialog and widgets
-        self.builder = get_builder('data/preferences.glade')
-        content = self.builder.get_object("dialog-content")
+        builder = get_builder('data/preferences.glade')
+        content = builder.get_object("dialog-content")
         self.get_content_area().add(content)
 
+        # Widgets editing the configuration, indexed by key
+        self.entries = {key: builder.get_object(key) for key in self.ENTRIES}
+        self.spins = {key: builder.get_object(key) for key in self.SPINS}
+        self.checks = {key: builder.get_object(key) for key in self.CHECKS}
+        self.files = {key: builder.get_object(key) for key in self.FILES}
+
     def save_config(self):
         """Save the configuration in the database"""
-        with database.transaction():
-            for key in self.ENTRIES:
-                entry = self.builder.get_object(key)
-                Config.set_value(key, entry.get_text())
+        values = {}
+
+        for key, entry in self.entries.items():
+            values[key] = entry.get_text()
 
-            for key in self.SPINS:
-                spinbutton = self.builder.get_object(key)
-                Config.set_value(key, spinbutton.get_value_as_int())
+        for key, spinbutton in self.spins.items():
+            values[key] = spinbutton.get_value_as_int()
 
-            for key in self.CHECKS:
-                checkbutton = self.builder.get_object(key)
-                Config.set_value(key, checkbutton.get_active())
+        for key, checkbutton in self.checks.items():
+            values[key] = checkbutton.get_active()
 
-            for key in self.FILES:
-                filechooser = self.builder.get_object(key)
-                Config.set_value(key, filechooser.get_filename())
+        for key, filechooser in self.files.items():
+            values[key] = filechooser.get_filename()
+
+        with database.transaction():
+            Config.set_values(values)
 
     def load_config(self):
         """Load the configuration from the database"""
-        for key in self.ENTRIES:
-            entry = self.builder.get_object(key)
-            entry.set_text(Config.get_value(key))
+        values = Config.get_values(self.KEYS)
+
+        for key, entry in self.entries.items():
+            entry.set_text(values[key])
 
-        for key in self.SPINS:
-            spinbutton = self.builder.get_object(key)
-            spinbutton.set_value(Config.get_value(key))
+        for key, spinbutton in self.spins.items():
+            spinbutton.set_value(values[key])
 
-        for key in self.CHECKS:
-            checkbutton = self.builder.get_object(key)
-            checkbutton.set_active(Config.get_value(key))
+        for key, checkbutton in self.checks.items():
+            checkbutton.set_active(values[key])
 
-        for key in self.FILES:
-            filechooser = self.builder.get_object(key)
-            filechooser.set_filename(Config.get_value(key))
+        for key, filechooser in self.files.items():
+            filechooser.set_filename(values[key])
 
 
 def run(window=None):
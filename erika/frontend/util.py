@@ -26,9 +26,29 @@
 Frontend utility functions
 """
 
+from functools import lru_cache
+import logging
 import pkgutil
+from queue import Queue, Empty
+import re
+from threading import Lock
+from gi.repository import GLib
 from gi.repository import Gtk
 
+# Maximal number of calls made by each iteration of the idle callback
+DISPATCH_BATCH_SIZE = 32
+
+# Calls waiting to be made in the main thread
+_CALLS = Queue()
+# True if the idle callback making the calls is scheduled
+_DISPATCH_SCHEDULED = False
+_DISPATCH_LOCK = Lock()
+
+# Characters that need to be escaped in markup, including the control
+# characters that GLib.markup_escape_text replaces by character references
+MARKUP_CHARACTERS = re.compile(
+    r"[&<>'\"\x01-\x08\x0b\x0c\x0e-\x1f\x7f-\x84\x86-\x9f]")
+
 
 def cb(function, n=1):  # pylint: disable=invalid-name
     """Create a callback whose first n argument are ignored
@@ -38,10 +58,93 @@ def cb(function, n=1):  # pylint: disable=invalid-name
     cb(f)(ignored, *args) == f(*args)
     cb(f, 2)(i1, i2, *args) == f(*args)
     """
+    # The common cases do not need to slice the arguments
+    if n == 1:
+        return lambda _, *args: function(*args)
+    elif n == 2:
+        return lambda _1, _2, *args: function(*args)
     return lambda *args: function(*args[n:])
 
 
+def escape_markup(text):
+    """Escape a text for use in markup.
+
+    Same as ``GLib.markup_escape_text``, but the (common) texts that do not
+    contain any special character are returned without calling GLib.
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    -------
+    str
+    """
+    if MARKUP_CHARACTERS.search(text) is None:
+        return text
+    return GLib.markup_escape_text(text)
+
+
+def idle_call(function, *args):
+    """Call a function in the main thread.
+
+    This function can be used instead of ``GLib.idle_add`` by worker threads:
+    all the calls go through a single queue, emptied by a single idle
+    callback, instead of adding a new event source for each call.
+
+    Parameters
+    ----------
+    function : callable
+        The function (its return value is ignored).
+    args
+        The arguments of the function.
+    """
+    global _DISPATCH_SCHEDULED  # pylint: disable=global-statement
+
+    _CALLS.put((function, args))
+
+    with _DISPATCH_LOCK:
+        if not _DISPATCH_SCHEDULED:
+            _DISPATCH_SCHEDULED = True
+            GLib.idle_add(_dispatch)
+
+
+def _dispatch():
+    """Make the calls queued by :func:`idle_call`"""
+    global _DISPATCH_SCHEDULED  # pylint: disable=global-statement
+
+    for _ in range(DISPATCH_BATCH_SIZE):
+        try:
+            function, args = _CALLS.get_nowait()
+        except Empty:
+            break
+
+        # An exception would remove the idle callback while it is still
+        # marked as scheduled, and the following calls would never be made
+        try:
+            function(*args)
+        except Exception:  # pylint: disable=broad-except
+            logger = logging.getLogger(__name__)
+            logger.exception("Error in a call made in the main thread.")
+
+    with _DISPATCH_LOCK:
+        if _CALLS.empty():
+            _DISPATCH_SCHEDULED = False
+            return False
+
+    # Let the main loop handle the other events before the next batch
+    return True
+
+
+@lru_cache(maxsize=None)
+def _get_builder_data(filename):
+    """Return the content of a package data file describing a user interface.
+
+    The files are only read and decoded the first time they are requested,
+    as some of them are used each time a dialog is opened."""
+    return pkgutil.get_data('erika.frontend', filename).decode('utf-8')
+
+
 def get_builder(filename):
     """Create a Gtk.Builder from a package data file"""
-    data = pkgutil.get_data('erika.frontend', filename).decode('utf-8')
-    return Gtk.Builder.new_from_string(data, -1)
+    return Gtk.Builder.new_from_string(_get_builder_data(filename), -1)
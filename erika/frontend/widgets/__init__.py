@@ -29,7 +29,7 @@ Some simple widgets.
 from .filter_button import FilterButton
 from .indexed_listbox import IndexedListBox
 from .label import Label
-from .listbox import ListBox
+from .listbox import ListBox, is_visible
 from .network_button import NetworkButton
 from .paned import Paned
 from .scrolled_window import ScrolledWindow
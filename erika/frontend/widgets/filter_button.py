@@ -57,14 +57,23 @@ class FilterButton(Gtk.ToggleButton):
         self.key = key
         self.state = None
 
+        # The inactive and true states look the same (only the active state of
+        # the button differs), so they share the same image (an image cannot
+        # be shared by several buttons, since it is a widget)
         self.inactive_image = Gtk.Image.new_from_icon_name(
             icon_name, Gtk.IconSize.SMALL_TOOLBAR)
-        self.filter_true_image = Gtk.Image.new_from_icon_name(
-            icon_name, Gtk.IconSize.SMALL_TOOLBAR)
+        self.filter_true_image = self.inactive_image
         self.filter_false_image = Gtk.Image.new_from_icon_name(
             icon_name, Gtk.IconSize.SMALL_TOOLBAR)
         self.filter_false_image.set_opacity(0.5)
 
+        # Image and tooltip of the button, indexed by state
+        self.appearances = {
+            None: (self.inactive_image, "Show only {}".format(name)),
+            True: (self.filter_true_image, "Hide {}".format(name)),
+            False: (self.filter_false_image, "Show all"),
+        }
+
         self._set_state(None)
 
     def _set_state(self, state):
@@ -77,15 +86,9 @@ class FilterButton(Gtk.ToggleButton):
         self.state = state
         self.set_active(state is not None)
 
-        if self.state is None:
-            self.set_image(self.inactive_image)
-            self.set_tooltip_text("Show only {}".format(self.name))
-        elif self.state:
-            self.set_image(self.filter_true_image)
-            self.set_tooltip_text("Hide {}".format(self.name))
-        else:
-            self.set_image(self.filter_false_image)
-            self.set_tooltip_text("Show all")
+        image, tooltip = self.appearances[state]
+        self.set_image(image)
+        self.set_tooltip_text(tooltip)
 
     def _on_button_press_event(self, event):
         """Called when the button is clicked"""
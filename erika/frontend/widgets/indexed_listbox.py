@@ -28,6 +28,8 @@ A ListBox whose rows are indexed
 
 import logging
 
+from gi.repository import Gtk
+
 from .listbox import ListBox
 
 
@@ -43,11 +45,15 @@ class IndexedListBox(ListBox):
     def get_ids(self):
         """Return the ids of all the rows
 
+        The ids are returned as a view, which reflects the later additions
+        and removals of rows: callers that need a snapshot of the ids (for
+        instance to modify it) should copy it in a set.
+
         Returns
         -------
-        set
+        KeysView
         """
-        return set(self.rows.keys())
+        return self.rows.keys()
 
     def get_row(self, row_id):
         """Return a row given its id
@@ -65,11 +71,25 @@ class IndexedListBox(ListBox):
         ------
         ValueError if there is no row with this id
         """
-        if row_id not in self.rows:
+        try:
+            return self.rows[row_id]
+        except KeyError:
             raise ValueError(
                 "The ListBox has no row with id '{}'.".format(row_id))
 
-        return self.rows[row_id]
+    def get_row_or_none(self, row_id):
+        """Return a row given its id, or None if there is no row with this id
+
+        Parameters
+        ----------
+        row_id
+            The id of the row
+
+        Returns
+        -------
+        Gtk.ListBoxRow, optional
+        """
+        return self.rows.get(row_id)
 
     def add_with_id(self, row, row_id):
         """Add a row with a certain id
@@ -85,11 +105,10 @@ class IndexedListBox(ListBox):
         ------
         ValueError if there is already a row with this id
         """
-        if row_id in self.rows:
+        if self.rows.setdefault(row_id, row) is not row:
             raise ValueError(
                 "The ListBox already has a row with id '{}'.".format(row_id))
 
-        self.rows[row_id] = row
         self.add(row)
 
     def remove_id(self, row_id):
@@ -112,9 +131,22 @@ class IndexedListBox(ListBox):
 
         self.remove(row)
 
+    def discard_id(self, row_id):
+        """Remove the id of a row which was removed from the list by other
+        means (e.g. destroyed), so that a new row can be added with this id
+
+        Does nothing if there is no row with this id.
+
+        Parameters
+        ----------
+        row_id
+            The id of the removed row
+        """
+        self.rows.pop(row_id, None)
+
     def clear(self):
         """Remove all the rows"""
-        for child in self.get_children():
-            child.destroy()
-
         self.rows = {}
+
+        # Destroy the rows without building the list of children
+        self.foreach(Gtk.Widget.destroy)
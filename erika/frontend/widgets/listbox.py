@@ -30,6 +30,21 @@ from gi.repository import Gtk
 from gi.repository import Gdk
 
 
+def is_visible(row):
+    """Return True if a row is shown by the filter of its listbox.
+
+    The listbox stores the result of its filter function in the child-visible
+    flag of the rows when the filter is applied, so the filter function does
+    not need to be called again.
+
+    Parameters
+    ----------
+    row : Gtk.ListBoxRow
+        A child of a ListBox
+    """
+    return row.get_child_visible()
+
+
 class ListBox(Gtk.ListBox):
     """A Gtk.ListBox patched to handle multiple selection"""
     def __init__(self):
@@ -57,22 +72,22 @@ class ListBox(Gtk.ListBox):
     def invalidate_filter(self):  # pylint: disable=arguments-differ
         Gtk.ListBox.invalidate_filter(self)
 
-        if self.last_clicked and not self.filter_func(self.last_clicked):
+        if self.last_clicked and not is_visible(self.last_clicked):
             self.last_clicked = None
-        if self.last_focused and not self.filter_func(self.last_focused):
+        if self.last_focused and not is_visible(self.last_focused):
             self.last_focused = None
 
         # Unselect the rows that are not visible
         for row in self.get_selected_rows():
-            if not self.filter_func(row):
+            if not is_visible(row):
                 self.unselect_row(row)
 
     def _on_button_press_event(self, event):
         # Propagate the event if it is not a single left button click or in
-        # single selection mode
-        if any((self.get_selection_mode() != Gtk.SelectionMode.MULTIPLE,
-                event.type != Gdk.EventType.BUTTON_PRESS,
-                event.button != 1 and event.button != 3)):
+        # single selection mode (the event is checked before the listbox)
+        if (event.type != Gdk.EventType.BUTTON_PRESS or
+                event.button != 1 and event.button != 3 or
+                self.get_selection_mode() != Gtk.SelectionMode.MULTIPLE):
             return False
 
         # Get the row that was clicked
@@ -106,8 +121,8 @@ class ListBox(Gtk.ListBox):
     def _on_key_press_event(self, event):
         # Propagate the event if the key pressed is not up or down or in single
         # selection mode
-        if any((self.get_selection_mode() != Gtk.SelectionMode.MULTIPLE,
-                event.keyval != Gdk.KEY_Up and event.keyval != Gdk.KEY_Down)):
+        if (event.keyval != Gdk.KEY_Up and event.keyval != Gdk.KEY_Down or
+                self.get_selection_mode() != Gtk.SelectionMode.MULTIPLE):
             return False
 
         if self.last_clicked is None:
@@ -118,18 +133,17 @@ class ListBox(Gtk.ListBox):
         # Get the index of the next or previous row depending on the key
         # pressed
         index = self.last_focused.get_index()
-        if event.keyval == Gdk.KEY_Up:
-            delta = 1
-        elif event.keyval == Gdk.KEY_Down:
-            delta = 1
+        delta = -1 if event.keyval == Gdk.KEY_Up else 1
 
-        # Get the next/previous visible row
+        # Get the next/previous visible row (the hidden rows are skipped using
+        # the visibility stored by the listbox, without calling the filter
+        # function)
         while True:
             index += delta
             row = self.get_row_at_index(index)
             if row is None:
                 return True
-            if self.filter_func(row):
+            if is_visible(row):
                 break
 
         if event.state & Gdk.ModifierType.SHIFT_MASK:
@@ -188,5 +202,5 @@ class ListBox(Gtk.ListBox):
         for index in range(first, last + 1):
             row = self.get_row_at_index(index)
             # Select only the visible rows
-            if self.filter_func(row):
+            if is_visible(row):
                 self.select_row(row)
@@ -36,6 +36,7 @@ class Paned(Gtk.Paned):
         super().__init__()
 
         self.limit_width = 0
+        self.orientation = self.get_orientation()
 
         self.connect('size_allocate', Paned._on_size_allocate)
 
@@ -48,6 +49,12 @@ class Paned(Gtk.Paned):
 
     def _on_size_allocate(self, allocation):
         if allocation.width < self.limit_width:
-            self.set_orientation(Gtk.Orientation.VERTICAL)
+            orientation = Gtk.Orientation.VERTICAL
         else:
-            self.set_orientation(Gtk.Orientation.HORIZONTAL)
+            orientation = Gtk.Orientation.HORIZONTAL
+
+        # Only set the orientation when it changes (size-allocate is emitted
+        # continuously while the window is resized)
+        if orientation != self.orientation:
+            self.orientation = orientation
+            self.set_orientation(orientation)
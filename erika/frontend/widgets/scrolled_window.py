@@ -44,9 +44,43 @@ class ScrolledWindow(Gtk.ScrolledWindow):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.connect_after("notify::max-content-height",
-                           lambda obj, param: self.queue_resize())
+                           ScrolledWindow._on_max_content_changed)
         self.connect_after("notify::max-content-width",
-                           lambda obj, param: self.queue_resize())
+                           ScrolledWindow._on_max_content_changed)
+
+        # Sizes of the border, cached until the style or the state of the
+        # widget changes
+        self.border_sizes = None
+        self.connect("style-updated", ScrolledWindow._on_style_changed)
+        self.connect("state-flags-changed", ScrolledWindow._on_style_changed)
+
+    def _on_max_content_changed(self, param):
+        """Called when the maximal size of the content changes.
+
+        GTK only recomputes the size once per frame, however many times
+        queue_resize is called, so setting both properties in a row only
+        causes a single size negotiation."""
+        self.queue_resize()
+
+    def _on_style_changed(self, *args):
+        """Called when the style or the state of the widget changes"""
+        self.border_sizes = None
+
+    def _get_border_sizes(self):
+        """Return the vertical (top and bottom) and horizontal (left and
+        right) sizes of the border of the widget
+
+        Returns
+        -------
+        Tuple[int, int]
+        """
+        if self.border_sizes is None:
+            style = self.get_style_context()
+            border = style.get_border(style.get_state())
+            self.border_sizes = (border.top + border.bottom,
+                                 border.left + border.right)
+
+        return self.border_sizes
 
     def set_max_content_height(self, value):
         # pylint: disable=arguments-differ
@@ -71,16 +105,16 @@ class ScrolledWindow(Gtk.ScrolledWindow):
         )
         child = self.get_child()
 
-        if natural_height and self.max_content_height > -1 and child:
-            style = self.get_style_context()
-            border = style.get_border(style.get_state())
-            additional = border.top + border.bottom
-
+        # The child is only measured if the natural height can grow (GTK
+        # caches the measure of the child until it changes)
+        max_content_height = self.max_content_height
+        if (natural_height and max_content_height > natural_height and
+                child is not None):
             _, child_nat_height = child.get_preferred_height()
-            if all((child_nat_height > natural_height,
-                    self.max_content_height > natural_height)):
+            if child_nat_height > natural_height:
+                additional = self._get_border_sizes()[0]
                 natural_height = (
-                    min(self.max_content_height, child_nat_height) + additional
+                    min(max_content_height, child_nat_height) + additional
                 )
 
         return min_height, natural_height
@@ -92,16 +126,15 @@ class ScrolledWindow(Gtk.ScrolledWindow):
         )
         child = self.get_child()
 
-        if natural_width and self.max_content_width > -1 and child:
-            style = self.get_style_context()
-            border = style.get_border(style.get_state())
-            additional = border.left + border.right + 1
-
+        # The child is only measured if the natural width can grow
+        max_content_width = self.max_content_width
+        if (natural_width and max_content_width > natural_width and
+                child is not None):
             _, child_nat_width = child.get_preferred_width()
-            if all((child_nat_width > natural_width,
-                    self.max_content_width > natural_width)):
+            if child_nat_width > natural_width:
+                additional = self._get_border_sizes()[1] + 1
                 natural_width = (
-                    min(self.max_content_width, child_nat_width) + additional
+                    min(max_content_width, child_nat_width) + additional
                 )
 
         return min_width, natural_width
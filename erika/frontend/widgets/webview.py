@@ -57,9 +57,19 @@ class WebView(WebKit.WebView):
         settings.set_property('enable-scripts', False)
         settings.set_property('enable-default-context-menu', False)
 
+        # Disable the storage features, which are not needed to display static
+        # documents
+        settings.set_property('enable-html5-database', False)
+        settings.set_property('enable-html5-local-storage', False)
+        settings.set_property('enable-offline-web-application-cache', False)
+        settings.set_property('enable-private-browsing', True)
+
         self.first_draw = True
         self.stylesheet_filename = None
 
+        # Part of the loaded html preceding the body
+        self.head = None
+
         self.connect('navigation-policy-decision-requested',
                      self._on_link_clicked)
         self.connect('destroy', self._on_destroy)
@@ -101,6 +111,36 @@ class WebView(WebKit.WebView):
 
         return WebKit.WebView.do_draw(self, cr)
 
+    def load_html(self, html):
+        """Load an html document.
+
+        If the document has the same head as the one currently loaded, only
+        its body is replaced (through the DOM, which works with scripts
+        disabled), which is much cheaper than loading a new document.
+
+        Parameters
+        ----------
+        html : str
+            The html document.
+        """
+        try:
+            body_start = html.index("<body>")
+            body_end = html.rindex("</body>")
+        except ValueError:
+            head = None
+        else:
+            head = html[:body_start]
+
+        if (head is not None and head == self.head and
+                self.get_load_status() == WebKit.LoadStatus.FINISHED):
+            body = html[body_start + len("<body>"):body_end]
+            self.get_dom_document().get_body().set_inner_html(body)
+            self.get_vadjustment().set_value(0)
+            return
+
+        self.head = head
+        self.load_html_string(html, "")
+
     def _on_link_clicked(self, view, frame, request, action, decision):
         """Called when a link is clicked"""
         # pylint: disable=too-many-arguments,no-self-use
@@ -27,6 +27,7 @@ A field used to store an image.
 """
 
 import base64
+from functools import lru_cache
 from io import BytesIO
 from PIL import Image as PImage
 from peewee import BlobField
@@ -34,6 +35,40 @@ from peewee import BlobField
 from gi.repository import GdkPixbuf
 
 
+@lru_cache(maxsize=64)
+def _encode_png(data, width):
+    """Convert an image to png, and resize it.
+
+    The results are cached, as the same images (e.g. the image of a podcast)
+    are usually converted many times, by different :class:`Image` objects.
+
+    Parameters
+    ----------
+    data : bytes, optional
+        The image data, or None for an empty image.
+    width : int, optional
+        The width of the image, or None to keep the original width.
+
+    Returns
+    -------
+    bytes
+        The image in png format.
+    """
+    if data:
+        image = PImage.open(BytesIO(data))
+    else:
+        image = PImage.new('RGBA', (1, 1), (0, 0, 0, 0))
+
+    if width:
+        image = image.resize(
+            (width, width * image.height // image.width),
+            PImage.LANCZOS)
+
+    output = BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+
 class ImageField(BlobField):
     """A field used to store an image."""
     def db_value(self, image):
@@ -67,19 +102,7 @@ class Image(object):
         width : int, optional
             The width of the image, or None to keep the original width.
         """
-        if self.data:
-            image = PImage.open(BytesIO(self.data))
-        else:
-            image = PImage.new('RGBA', (1, 1), (0, 0, 0, 0))
-
-        if width:
-            image = image.resize(
-                (width, width * image.height // image.width),
-                PImage.LANCZOS)
-
-        data = BytesIO()
-        image.save(data, format='PNG')
-        return data.getvalue()
+        return _encode_png(self.data, width)
 
     def as_pixbuf(self, width=None):
         """
@@ -30,10 +30,13 @@ from collections import namedtuple
 import logging
 from peewee import TextField
 
-from erika.config import CONFIG_DEFAULTS
+from erika.config import get_defaults
 from erika.library.fields import JSONField
 from .database import BaseModel
 
+# Values returned by Config.get_cached_value, indexed by key
+_CACHE = {}
+
 
 class Config(BaseModel):
     """A model storing the configuration of the application as ``(key, value)``
@@ -53,6 +56,19 @@ class Config(BaseModel):
         """Return the value associated to a key."""
         return cls.get(Config.key == key).value
 
+    @classmethod
+    def get_cached_value(cls, key):
+        """Return the value associated to a key, only querying the database
+        the first time it is requested.
+
+        The cached value is updated by :meth:`set_value`."""
+        try:
+            return _CACHE[key]
+        except KeyError:
+            value = cls.get_value(key)
+            _CACHE[key] = value
+            return value
+
     @classmethod
     def set_value(cls, key, value):
         """Set the value associated to a key."""
@@ -60,19 +76,60 @@ class Config(BaseModel):
         config.value = value
         config.save()
 
+        _CACHE.pop(key, None)
+
+    @classmethod
+    def get_values(cls, keys):
+        """Return the values associated to several keys, with a single query.
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+            The keys.
+
+        Returns
+        -------
+        dict
+            A dictionnary mapping the keys to their values (the keys that are
+            not defined are missing).
+        """
+        return {config.key: config.value
+                for config in cls.select().where(cls.key.in_(list(keys)))}
+
+    @classmethod
+    def set_values(cls, values):
+        """Set the values associated to several keys, with a single query.
+
+        Parameters
+        ----------
+        values : dict
+            A dictionnary mapping the keys to their new values.
+        """
+        if not values:
+            return
+
+        (cls
+         .insert_many({"key": key, "value": value}
+                      for key, value in values.items())
+         .on_conflict('REPLACE')
+         .execute())
+
+        for key in values:
+            _CACHE.pop(key, None)
+
     @classmethod
     def set_defaults(cls):
         """Set the default configuration values (ignoring the values that are
         already defined).
 
-        The default values are stored in the
-        :py:obj:`erika.config.CONFIG_DEFAULTS` dictionnary."""
+        The default values are returned by
+        :py:func:`erika.config.get_defaults`."""
         logger = logging.getLogger(".".join((__name__, cls.__name__)))
         logger.debug("Setting default configuration.")
 
         (cls
          .insert_many({"key": key, "value": value}
-                      for key, value in CONFIG_DEFAULTS.items())
+                      for key, value in get_defaults().items())
          .on_conflict('IGNORE')
          .execute())
 
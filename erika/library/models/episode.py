@@ -30,7 +30,7 @@ import logging
 import os.path
 import requests
 from peewee import (BooleanField, DateTimeField, IntegerField, DeferredForeignKey,
-                    TextField, Proxy, DoesNotExist)
+                    TextField, Proxy, DoesNotExist, fn)
 from playhouse.hybrid import hybrid_property
 
 from erika import tags
@@ -237,11 +237,15 @@ class Episode(BaseModel):
         int
             The total number of episodes.
         """
-        # pylint: disable=singleton-comparison
-        new = Episode.select().where(Episode.new == True).count()
-        played = Episode.select().where(Episode.played == True).count()
-        total = Episode.select().count()
-        return new, played, total
+        # Compute the three counts with a single scan of the table
+        new, played, total = Episode.select(
+            fn.SUM(Episode.new),
+            fn.SUM(Episode.played),
+            fn.COUNT(Episode.id)
+        ).tuples().get()
+
+        # SUM returns NULL if there are no episodes
+        return new or 0, played or 0, total
 
     def import_file(self, path):
         """Import the episode's audio file in the library.
@@ -29,7 +29,8 @@ A model used to store podcasts in the library.
 import logging
 import os.path
 import requests
-from peewee import BooleanField, TextField, DoesNotExist, IntegrityError, fn
+from peewee import (BooleanField, TextField, DoesNotExist, IntegrityError, fn,
+                    JOIN)
 
 from erika import parsers
 from erika.library.fields import Image, ImageField
@@ -128,6 +129,54 @@ class Podcast(BaseModel):
         """int: the number of episodes that have not been played."""
         return self.episodes_count - self.played_count
 
+    def get_counts(self):
+        """Return the counts of episodes displayed in the list of podcasts,
+        computed with a single query.
+
+        Returns
+        -------
+        int
+            The number of episodes of the podcast.
+        int
+            The number of episodes that have not been played.
+        int
+            The number of new episodes.
+        """
+        total, played, new = self.episodes.select(
+            fn.COUNT(Episode.id),
+            fn.SUM(Episode.played),
+            fn.SUM(Episode.new)
+        ).tuples().get()
+
+        # SUM returns NULL if there are no episodes
+        return total, total - (played or 0), new or 0
+
+    @classmethod
+    def select_with_counts(cls):
+        """Select all the podcasts along with their counts of episodes, with
+        a single query.
+
+        Yields
+        ------
+        :class:`Podcast`
+            A podcast.
+        Tuple[int, int, int]
+            Its counts of episodes (see :meth:`get_counts`).
+        """
+        query = (cls
+                 .select(cls,
+                         fn.COUNT(Episode.id).alias("counted_total"),
+                         fn.SUM(Episode.played).alias("counted_played"),
+                         fn.SUM(Episode.new).alias("counted_new"))
+                 .join(Episode, JOIN.LEFT_OUTER,
+                       on=(Episode.podcast == cls.id))
+                 .group_by(cls.id))
+
+        for podcast in query:
+            total = podcast.counted_total
+            yield podcast, (total, total - (podcast.counted_played or 0),
+                            podcast.counted_new or 0)
+
     @classmethod
     def new(cls, parser, url):
         """Create a new podcast, and add it to the database
@@ -162,6 +211,20 @@ class Podcast(BaseModel):
 
     def update_podcast(self):
         """Update the podcast."""
+        self.save_update(self.fetch_update())
+
+    def fetch_update(self):
+        """Parse the podcast's source, and download its image if it changed.
+
+        This method does not access the database, so that several podcasts
+        can be fetched concurrently. The result should then be passed to
+        :meth:`save_update`.
+
+        Returns
+        -------
+        list of :class:`Episode`, optional
+            The podcast's episodes, or None if the update failed.
+        """
         logger = logging.getLogger(
             ".".join((__name__, self.__class__.__name__)))
         logger.info("Updating the podcast %s.", self.display_title)
@@ -174,7 +237,30 @@ class Podcast(BaseModel):
             dirty_fields = [field.name for field in self.dirty_fields]
             if 'image_url' in dirty_fields:
                 self.download_image()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Unable to update the podcast.")
+            return None
+
+        return episodes
+
+    def save_update(self, episodes):
+        """Save the podcast and its episodes in the database after an update.
 
+        Parameters
+        ----------
+        episodes : list of :class:`Episode`, optional
+            The episodes returned by :meth:`fetch_update` (None if the update
+            failed).
+        """
+        logger = logging.getLogger(
+            ".".join((__name__, self.__class__.__name__)))
+
+        if episodes is None:
+            self.update_failed = True
+            self.save()
+            return
+
+        try:
             # Get the track number that should be used for the next new episode
             next_track_number = self.get_next_track_number()
 
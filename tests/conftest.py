@@ -0,0 +1,19 @@
+# -*- coding : utf-8 -*-
+
+import pytest
+
+from erika import library
+from erika.library.models import config, database
+
+
+@pytest.fixture
+def library_database(tmp_path):
+    """Initialize an empty library database in a temporary directory"""
+    # The cached configuration values belong to the previous database
+    config._CACHE.clear()  # pylint: disable=protected-access
+
+    library.initialize(str(tmp_path))
+    yield database
+
+    config._CACHE.clear()  # pylint: disable=protected-access
+    database.close()
@@ -0,0 +1,48 @@
+# -*- coding : utf-8 -*-
+
+from erika.library.models import Config
+
+
+def count_rows(key):
+    """Return the number of rows of the config table with a key"""
+    return Config.select().where(Config.key == key).count()
+
+
+def test_set_value_updates_cache(library_database):
+    """Test that set_value invalidates the cached value"""
+    Config.set_value("test.key", 1)
+    assert Config.get_cached_value("test.key") == 1
+
+    Config.set_value("test.key", 2)
+    assert Config.get_cached_value("test.key") == 2
+    assert count_rows("test.key") == 1
+
+
+def test_set_values_updates_cache(library_database):
+    """Test that set_values invalidates the cached values and replaces the
+    existing rows"""
+    Config.set_values({"test.first": 1, "test.second": "a"})
+    assert Config.get_cached_value("test.first") == 1
+    assert Config.get_cached_value("test.second") == "a"
+
+    Config.set_values({"test.first": 2, "test.second": "b"})
+    assert Config.get_cached_value("test.first") == 2
+    assert Config.get_cached_value("test.second") == "b"
+    assert count_rows("test.first") == 1
+    assert count_rows("test.second") == 1
+
+
+def test_get_values(library_database):
+    """Test for get_values"""
+    Config.set_values({"test.first": 1, "test.second": [1, 2]})
+    Config.set_value("test.first", 3)
+
+    values = Config.get_values(["test.first", "test.second", "test.missing"])
+    assert values == {"test.first": 3, "test.second": [1, 2]}
+
+
+def test_set_values_empty(library_database):
+    """Test that set_values does nothing when there is no value to set"""
+    count = Config.select().count()
+    Config.set_values({})
+    assert Config.select().count() == count
@@ -0,0 +1,30 @@
+# -*- coding : utf-8 -*-
+
+from erika.library.models import Episode, Podcast
+
+
+def test_get_counts(library_database):
+    """Test for Episode.get_counts"""
+    podcast = Podcast.create(parser="rss", url="http://example.com/feed")
+    other = Podcast.create(parser="rss", url="http://example.com/other")
+
+    episodes = [
+        (podcast, True, False),
+        (podcast, False, True),
+        (podcast, False, False),
+        (other, True, False),
+        (other, False, True),
+    ]
+    for track_number, (episode_podcast, new, played) in enumerate(episodes):
+        Episode.create(podcast=episode_podcast, track_number=track_number,
+                       new=new, played=played)
+
+    # New, played and total episodes
+    assert Episode.get_counts() == (2, 2, 5)
+
+
+def test_get_counts_no_episodes(library_database):
+    """Test for Episode.get_counts with an empty library"""
+    Podcast.create(parser="rss", url="http://example.com/feed")
+
+    assert Episode.get_counts() == (0, 0, 0)
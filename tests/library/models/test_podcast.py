@@ -0,0 +1,57 @@
+# -*- coding : utf-8 -*-
+
+from erika.library.models import Episode, Podcast
+
+
+def create_podcast(url, episodes):
+    """Create a podcast with episodes given as ``(new, played)`` pairs"""
+    podcast = Podcast.create(parser="rss", url=url)
+    for track_number, (new, played) in enumerate(episodes):
+        Episode.create(podcast=podcast, track_number=track_number,
+                       new=new, played=played)
+    return podcast
+
+
+def test_get_counts(library_database):
+    """Test for Podcast.get_counts"""
+    podcast = create_podcast("http://example.com/feed", [
+        (True, False),
+        (True, False),
+        (False, True),
+        (False, False),
+    ])
+    create_podcast("http://example.com/other", [(True, False)])
+
+    # Total, unplayed and new episodes
+    assert podcast.get_counts() == (4, 3, 2)
+
+
+def test_get_counts_no_episodes(library_database):
+    """Test for Podcast.get_counts with a podcast without episodes"""
+    podcast = create_podcast("http://example.com/feed", [])
+
+    assert podcast.get_counts() == (0, 0, 0)
+
+
+def test_select_with_counts(library_database):
+    """Test for Podcast.select_with_counts"""
+    full = create_podcast("http://example.com/full", [
+        (True, True),
+        (False, True),
+        (True, False),
+    ])
+    empty = create_podcast("http://example.com/empty", [])
+    played = create_podcast("http://example.com/played", [(False, True)])
+
+    counts = {podcast.id: podcast_counts
+              for podcast, podcast_counts in Podcast.select_with_counts()}
+
+    # The podcasts without episodes are selected too
+    assert counts == {
+        full.id: (3, 1, 2),
+        empty.id: (0, 0, 0),
+        played.id: (1, 0, 0),
+    }
+    for podcast_id, podcast_counts in counts.items():
+        assert Podcast.get(Podcast.id == podcast_id).get_counts() == \
+            podcast_counts
@@ -0,0 +1,150 @@
+# -*- coding : utf-8 -*-
+
+from queue import Queue
+from threading import Event
+import time
+
+from erika.downloads import DownloadsPool, FinishWorker
+from erika.library.models import Config
+
+# Maximal time to wait for the threads, in seconds
+TIMEOUT = 5
+
+
+class FakeJob(object):
+    """Download job recording the calls made by the pool
+
+    The ``save`` method stores a configuration value in the database, which
+    makes it possible to check that it was committed.
+    """
+    def __init__(self, name, fail_save=False, block=False):
+        self.name = name
+        self.fail_save = fail_save
+        self.block = block
+
+        self.calls = []
+        self.canceled = False
+        self.started = Event()
+        self.finished = Event()
+
+    def cancel(self):
+        self.canceled = True
+
+    def start(self, session):
+        self.calls.append("start")
+        self.started.set()
+
+        # Simulate a download which lasts until it is canceled
+        while self.block and not self.canceled:
+            time.sleep(0.01)
+
+        return not self.canceled
+
+    def prepare(self):
+        self.calls.append("prepare")
+
+    def save(self):
+        self.calls.append("save")
+        Config.create(key="test.{}".format(self.name), value=True)
+
+        if self.fail_save:
+            raise RuntimeError("Unable to save {}".format(self.name))
+
+    def finish(self):
+        self.calls.append("finish")
+        self.finished.set()
+
+
+def is_saved(job):
+    """Return True if the configuration value stored by a job is in the
+    database"""
+    key = "test.{}".format(job.name)
+    return Config.select().where(Config.key == key).exists()
+
+
+def test_pool_runs_each_job_once(library_database):
+    """Test that the queued jobs are prepared, saved and finished once"""
+    Config.set_value("downloads.workers", 2)
+    pool = DownloadsPool()
+
+    jobs = [FakeJob(index) for index in range(10)]
+    for job in jobs:
+        pool.add(job)
+
+    for job in jobs:
+        assert job.finished.wait(TIMEOUT)
+
+    pool.stop()
+    pool.finish_worker.join(TIMEOUT)
+    assert not pool.finish_worker.is_alive()
+
+    for job in jobs:
+        assert job.calls == ["start", "prepare", "save", "finish"]
+        assert is_saved(job)
+
+
+def test_pool_has_a_worker(library_database):
+    """Test that the pool starts a worker when none is configured"""
+    Config.set_value("downloads.workers", 0)
+    pool = DownloadsPool()
+
+    job = FakeJob("job")
+    pool.add(job)
+    assert job.finished.wait(TIMEOUT)
+
+    pool.stop()
+    pool.finish_worker.join(TIMEOUT)
+    assert len(pool.workers) == 1
+    assert not pool.finish_worker.is_alive()
+
+
+def test_pool_stop_with_queued_jobs(library_database):
+    """Test that the pool stops without executing the queued jobs"""
+    Config.set_value("downloads.workers", 1)
+    pool = DownloadsPool()
+
+    running = FakeJob("running", block=True)
+    queued = [FakeJob(index) for index in range(5)]
+    pool.add(running)
+    for job in queued:
+        pool.add(job)
+
+    assert running.started.wait(TIMEOUT)
+    pool.stop()
+
+    for worker in pool.workers:
+        worker.join(TIMEOUT)
+        assert not worker.is_alive()
+    pool.finish_worker.join(TIMEOUT)
+    assert not pool.finish_worker.is_alive()
+
+    assert running.calls == ["start"]
+    for job in queued:
+        assert job.calls == []
+
+
+def test_finish_worker_failing_save(library_database):
+    """Test that a job whose save fails does not prevent the other jobs of
+    the batch from being saved and finished"""
+    jobs = [FakeJob("first"), FakeJob("failing", fail_save=True),
+            FakeJob("last")]
+
+    # Queue the jobs before starting the worker, so that they are saved in a
+    # single transaction
+    queue = Queue()
+    for job in jobs:
+        queue.put(job)
+    queue.put(None)
+
+    worker = FinishWorker(queue)
+    worker.join(TIMEOUT)
+    assert not worker.is_alive()
+
+    first, failing, last = jobs
+    assert first.calls == ["prepare", "save", "finish"]
+    assert failing.calls == ["prepare", "save"]
+    assert last.calls == ["prepare", "save", "finish"]
+
+    assert is_saved(first)
+    assert not is_saved(failing)
+    assert is_saved(last)
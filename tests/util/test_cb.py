@@ -0,0 +1,34 @@
+# -*- coding : utf-8 -*-
+
+import pytest
+
+from erika.frontend.util import cb
+
+
+def collect(*args):
+    """Return the arguments of the function"""
+    return args
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3])
+def test_cb(n):
+    """Test that cb ignores the first n arguments"""
+    args = ("a", "b", "c", "d", "e")
+    assert cb(collect, n)(*args) == args[n:]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3])
+def test_cb_no_arguments_left(n):
+    """Test for cb when there are only n arguments"""
+    args = ("a", "b", "c")[:n]
+    assert cb(collect, n)(*args) == ()
+
+
+def test_cb_default():
+    """Test that cb ignores the first argument by default"""
+    assert cb(collect)("widget", 1, 2) == (1, 2)
+
+
+def test_cb_return_value():
+    """Test that cb returns the result of the function"""
+    assert cb(len, 2)("widget", "event", "abc") == 3
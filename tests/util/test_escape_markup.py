@@ -0,0 +1,46 @@
+# -*- coding : utf-8 -*-
+
+import pytest
+from gi.repository import GLib
+
+from erika.frontend.util import escape_markup
+
+
+@pytest.mark.parametrize("text, escaped", [
+    # Texts without special characters
+    ("", ""),
+    ("abc", "abc"),
+    ("\xe9t\xe9", "\xe9t\xe9"),
+
+    # Markup characters
+    ("a & b", "a &amp; b"),
+    ("<b>", "&lt;b&gt;"),
+    ("'a' \"b\"", "&apos;a&apos; &quot;b&quot;"),
+
+    # C0 control characters, except tab, newline and carriage return
+    ("\x01", "&#x1;"),
+    ("\x08", "&#x8;"),
+    ("\t\n\r", "\t\n\r"),
+    ("\x0b\x0c", "&#xb;&#xc;"),
+    ("\x0e", "&#xe;"),
+    ("\x1f", "&#x1f;"),
+
+    # C1 control characters, except next line
+    ("\x7f", "&#x7f;"),
+    ("\x84", "&#x84;"),
+    ("\x85", "\x85"),
+    ("\x86", "&#x86;"),
+    ("\x9f", "&#x9f;"),
+    ("\xa0", "\xa0"),
+])
+def test_escape_markup(text, escaped):
+    """Tests for escape_markup"""
+    assert escape_markup(text) == escaped
+
+
+def test_escape_markup_glib():
+    """Test that escape_markup escapes the same characters as GLib"""
+    for code in range(1, 0x100):
+        character = chr(code)
+        assert escape_markup(character) == \
+            GLib.markup_escape_text(character), hex(code)